@@ -0,0 +1,89 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from reviews.models import DataVersion
+
+TITLES = 'titles'
+GENRES = 'genres'
+CATEGORIES = 'categories'
+
+
+def get_versions(*scopes):
+    """
+    Версии областей данных (произведения, отзывы произведения и т.п.).
+    Версия — время последнего изменения в наносекундах: входит в ключи
+    кэша и служит основой для ETag и Last-Modified. Хранится в базе,
+    а не в кэше: локальный кэш у каждого процесса свой.
+    """
+    stored = dict(
+        DataVersion.objects.filter(
+            scope__in=(*scopes, DataVersion.BULK_LOAD)
+        ).values_list('scope', 'value')
+    )
+    base = stored.get(DataVersion.BULK_LOAD, DataVersion.BASE)
+    return [max(stored.get(scope, base), base) for scope in scopes]
+
+
+def request_versions(request, *scopes):
+    """Версии, прочитанные один раз за запрос для ETag и ключа кэша."""
+    memo = getattr(request, '_versions', None)
+    if memo is None:
+        memo = request._versions = {}
+    missing = [scope for scope in scopes if scope not in memo]
+    if missing:
+        memo.update(zip(missing, get_versions(*missing)))
+    return [memo[scope] for scope in scopes]
+
+
+def invalidate(*scopes):
+    """
+    Меняет версии областей в транзакции изменения данных: откат
+    возвращает и версию, а другие процессы видят её вместе с данными.
+    """
+    for scope in scopes:
+        DataVersion.objects.bump(scope)
+
+
+def catalog_cache_key(request, scopes):
+    url = request.build_absolute_uri().encode()
+    versions = ','.join(
+        str(version) for version in request_versions(request, *scopes)
+    )
+    return 'catalog:{}:{}'.format(versions, hashlib.md5(url).hexdigest())
+
+
+def cached_response(scopes, handler, request, *args, **kwargs):
+    """
+    Отдаёт data из кэша или вызывает handler и кэширует ответ 200.
+    Ключ меняется вместе с версиями областей scopes.
+    """
+    key = catalog_cache_key(request, scopes)
+    data = cache.get(key)
+    if data is not None:
+        return Response(data)
+    response = handler(request, *args, **kwargs)
+    if response.status_code == status.HTTP_200_OK:
+        cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+    return response
+
+
+class CachedListMixin:
+    """Кэширует ответы list с учётом всей строки запроса."""
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            self.version_scopes, super().list, request, *args, **kwargs
+        )
+
+
+class CachedRetrieveMixin:
+    """Кэширует ответы retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(
+            self.version_scopes, super().retrieve, request, *args, **kwargs
+        )
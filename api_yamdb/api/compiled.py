@@ -0,0 +1,99 @@
+from functools import lru_cache
+from operator import attrgetter
+
+from django.db import models
+from django.utils.functional import cached_property
+from rest_framework import serializers
+
+# Поля, у которых to_representation — просто приведение типа.
+CONVERTERS = {
+    serializers.IntegerField: int,
+    serializers.CharField: str,
+    serializers.FloatField: float,
+}
+
+
+def _identity(value):
+    return value
+
+
+def _many(represent):
+    def represent_many(value):
+        if isinstance(value, models.Manager):
+            value = value.all()
+        return [represent(item) for item in value]
+    return represent_many
+
+
+def _converter(field):
+    if isinstance(field, serializers.ListSerializer):
+        return _many(compile_fields(field.child))
+    if isinstance(field, serializers.BaseSerializer):
+        return compile_fields(field)
+    if isinstance(field, serializers.SlugRelatedField):
+        return attrgetter(field.slug_field)
+    return CONVERTERS.get(type(field), field.to_representation)
+
+
+def _getter(field):
+    get = _identity if field.source == '*' else attrgetter(field.source)
+    convert = _converter(field)
+
+    def represent(instance):
+        value = get(instance)
+        # Как Serializer.to_representation: None выводится без поля.
+        return None if value is None else convert(value)
+    return represent
+
+
+def compile_fields(serializer):
+    """
+    Собирает из полей сериализатора функцию объект -> dict: поля читаются
+    заранее подготовленными attrgetter, а не через get_attribute и
+    to_representation каждого поля.
+    """
+    getters = tuple(
+        (field.field_name, _getter(field))
+        for field in serializer._readable_fields
+    )
+
+    def represent(instance):
+        return {name: get(instance) for name, get in getters}
+    return represent
+
+
+class CompiledSerializerMixin:
+    """
+    Только чтение: тот же набор полей и тот же JSON, что у исходного
+    сериализатора, но без обхода полей DRF на каждый объект.
+    """
+
+    @cached_property
+    def _compiled(self):
+        return compile_fields(self)
+
+    def to_representation(self, instance):
+        return self._compiled(instance)
+
+
+@lru_cache(maxsize=None)
+def compiled(serializer_class):
+    return type(
+        f'Compiled{serializer_class.__name__}',
+        (CompiledSerializerMixin, serializer_class), {}
+    )
+
+
+class CompiledReadMixin:
+    """
+    Включает compiled-сериализаторы для list и retrieve вьюсета.
+    Отключается атрибутом compiled_read = False.
+    """
+    compiled_read = True
+    compiled_actions = ('list', 'retrieve')
+
+    def get_serializer_class(self):
+        serializer_class = super().get_serializer_class()
+        if self.compiled_read and self.action in self.compiled_actions:
+            return compiled(serializer_class)
+        return serializer_class
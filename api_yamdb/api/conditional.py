@@ -0,0 +1,74 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.exceptions import APIException
+
+from .cache import request_versions
+
+CONDITIONAL_ACTIONS = ('list', 'retrieve', 'me')
+
+
+class NotModified(APIException):
+    status_code = 304
+
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    ETag и Last-Modified для чтения по версиям областей из api.cache.
+    Валидаторы проверяются одним запросом версий до выборки данных
+    и сериализации.
+    """
+
+    version_scopes = ()
+
+    def get_version_scopes(self):
+        return tuple(
+            scope.format(**self.kwargs) for scope in self.version_scopes
+        )
+
+    def get_validators(self, request):
+        versions = request_versions(request, *self.get_version_scopes())
+        source = '{}|{}|{}'.format(
+            request.build_absolute_uri(),
+            request.user.pk,
+            ','.join(str(version) for version in versions),
+        )
+        etag = quote_etag(hashlib.md5(source.encode()).hexdigest())
+        return etag, max(versions) // 10 ** 9
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._validators = None
+        if (
+            request.method not in ('GET', 'HEAD')
+            or self.action not in CONDITIONAL_ACTIONS
+            or not self.get_version_scopes()
+        ):
+            return
+        self._validators = self.get_validators(request)
+        etag, last_modified = self._validators
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        validators = getattr(self, '_validators', None)
+        if validators is not None and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,153 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Count, OuterRef, Subquery
+from django.urls import reverse
+from django.utils.functional import cached_property
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import Cursor
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from reviews.models import Comment
+
+from .compiled import compiled
+from .pagination import (CURSOR_MODE, CURSOR_MODE_PARAM,
+                         ReverseIdCursorPagination)
+from .serializers import CommentSerializer
+
+EXPAND_PARAM = 'expand'
+
+
+def latest_children(queryset, parent_field, parent_ids, limit):
+    """
+    Последние limit дочерних объектов каждого родителя одним запросом:
+    id IN (коррелированный подзапрос с LIMIT) по индексу (родитель, id).
+    """
+    latest = queryset.model.objects.filter(
+        **{parent_field: OuterRef(parent_field)}
+    ).order_by('-id').values('id')[:limit]
+    children = queryset.filter(
+        **{f'{parent_field}__in': parent_ids}, id__in=Subquery(latest)
+    ).order_by('-id')
+    grouped = defaultdict(list)
+    attname = queryset.model._meta.get_field(parent_field).attname
+    for child in children:
+        grouped[getattr(child, attname)].append(child)
+    return grouped
+
+
+def children_counts(queryset, parent_field, parent_ids):
+    return dict(
+        queryset.filter(**{f'{parent_field}__in': parent_ids}).order_by()
+        .values_list(parent_field).annotate(count=Count('id'))
+    )
+
+
+def continuation_url(request, url_name, url_kwargs, last_id):
+    """Ссылка на следующую страницу списка в курсорном режиме."""
+    paginator = ReverseIdCursorPagination()
+    paginator.base_url = request.build_absolute_uri(
+        reverse(url_name, kwargs=url_kwargs)
+    )
+    url = paginator.encode_cursor(
+        Cursor(offset=0, reverse=False, position=str(last_id))
+    )
+    return replace_query_param(url, CURSOR_MODE_PARAM, CURSOR_MODE)
+
+
+class ExpandMixin:
+    """
+    ?expand= встраивает в ответ первые EXPAND_LIMIT дочерних объектов
+    с общим количеством и ссылкой next на продолжение списка. Дочерние
+    объекты всех родителей загружаются одним запросом на уровень.
+
+    Встроенные коллекции меняются вместе с отзывами и комментариями,
+    поэтому такие ответы не кэшируются и не получают ETag.
+    """
+    expandable = ()
+    expand_actions = ()
+    # Колонки родителя, которые читает embed, по первой части имени
+    # из ?expand=: остаются в запросе при ?fields=.
+    expand_columns = {}
+
+    @cached_property
+    def expand(self):
+        value = self.request.query_params.get(EXPAND_PARAM)
+        if not value or self.action not in self.expand_actions:
+            return set()
+        names = {name.strip() for name in value.split(',') if name.strip()}
+        unknown = names - set(self.expandable)
+        if unknown:
+            raise ValidationError({EXPAND_PARAM: [
+                'Нельзя встроить: {}.'.format(', '.join(sorted(unknown)))
+            ]})
+        return names
+
+    def get_sparse_columns(self):
+        columns = set(super().get_sparse_columns())
+        for name in self.expand:
+            columns.update(self.expand_columns.get(name.split('.')[0], ()))
+        return columns
+
+    def get_version_scopes(self):
+        if self.expand:
+            return ()
+        return super().get_version_scopes()
+
+    def embed(self, objects, items):
+        raise NotImplementedError
+
+    def child_data(self, serializer_class, objects):
+        if getattr(self, 'compiled_read', False):
+            serializer_class = compiled(serializer_class)
+        return serializer_class(
+            objects, many=True, context=self.get_serializer_context()
+        ).data
+
+    def embedded(self, children, count, url_name, url_kwargs):
+        next_url = None
+        if count > len(children):
+            next_url = continuation_url(
+                self.request, url_name, url_kwargs, children[-1].id
+            )
+        return {'count': count, 'next': next_url, 'results': children}
+
+    def embed_comments(self, reviews, items):
+        """Добавляет к отзывам items их последние комментарии."""
+        ids = [review.id for review in reviews]
+        queryset = Comment.objects.select_related('author')
+        latest = latest_children(
+            queryset, 'review', ids, settings.EXPAND_LIMIT
+        )
+        counts = children_counts(queryset, 'review', ids)
+        for review, item in zip(reviews, items):
+            comments = latest.get(review.id, [])
+            collection = self.embedded(
+                comments, counts.get(review.id, 0), 'api:comments-list',
+                {'title_pk': review.title_id, 'review_pk': review.id},
+            )
+            collection['results'] = self.child_data(
+                CommentSerializer, comments
+            )
+            item['comments'] = collection
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.expand:
+            return super().retrieve(request, *args, **kwargs)
+        instance = self.get_object()
+        data = self.get_serializer(instance).data
+        self.embed([instance], [data])
+        return Response(data)
+
+    def list(self, request, *args, **kwargs):
+        if not self.expand:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        objects = list(queryset if page is None else page)
+        data = self.get_serializer(objects, many=True).data
+        self.embed(objects, data)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
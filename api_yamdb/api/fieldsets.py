@@ -0,0 +1,118 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.utils.functional import cached_property
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def _select_related_lookups(select_related, prefix=''):
+    for name, nested in select_related.items():
+        yield prefix + name
+        yield from _select_related_lookups(nested, f'{prefix}{name}__')
+
+
+def _lookup_name(lookup):
+    return lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+
+
+def narrow_queryset(queryset, fields, columns=()):
+    """
+    Оставляет в запросе только то, что нужно полям fields сериализатора:
+    ненужные select_related и prefetch_related убираются, собственные
+    колонки модели ограничиваются через only(). columns — колонки,
+    которые нужны представлению помимо полей ответа.
+    """
+    opts = queryset.model._meta
+    sources = {field.source.split('.')[0] for field in fields}
+
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        lookups = [
+            lookup for lookup in _select_related_lookups(select_related)
+            if lookup.split('__')[0] in sources
+        ]
+        queryset = queryset.select_related(None)
+        if lookups:
+            queryset = queryset.select_related(*lookups)
+
+    prefetches = queryset._prefetch_related_lookups
+    if prefetches:
+        queryset = queryset.prefetch_related(None).prefetch_related(*(
+            lookup for lookup in prefetches
+            if _lookup_name(lookup).split('__')[0] in sources
+        ))
+
+    if '*' in sources:
+        return queryset
+    # Внешние ключи, которые менеджер проставляет без запроса
+    # (review.title из title.reviews), должны остаться в выборке.
+    only = {opts.pk.name, *columns} | {
+        field.name for field in queryset._known_related_objects
+    }
+    for source in sources:
+        try:
+            field = opts.get_field(source)
+        except FieldDoesNotExist:
+            # Свойство модели: какие колонки ему нужны, неизвестно.
+            return queryset
+        if field.concrete:
+            only.add(field.name)
+    return queryset.only(*only)
+
+
+class SparseFieldsetMixin:
+    """
+    ?fields=id,name оставляет в ответе только перечисленные поля,
+    ?omit=genre убирает поля. Работает для GET-запросов и сужает запрос
+    к базе вместе с ответом.
+    """
+
+    def _parse_fields(self, param, available):
+        value = self.request.query_params.get(param)
+        if value is None:
+            return None
+        names = {name.strip() for name in value.split(',') if name.strip()}
+        unknown = names - set(available)
+        if unknown:
+            raise ValidationError({param: [
+                'Неизвестные поля: {}.'.format(', '.join(sorted(unknown)))
+            ]})
+        return names
+
+    @cached_property
+    def sparse_fields(self):
+        """Поля сериализатора, которые остаются в ответе, или None."""
+        request = self.request
+        if request.method not in ('GET', 'HEAD') or not (
+                FIELDS_PARAM in request.query_params
+                or OMIT_PARAM in request.query_params):
+            return None
+        fields = self.get_serializer_class()(
+            context=self.get_serializer_context()
+        ).fields
+        kept = self._parse_fields(FIELDS_PARAM, fields) or set(fields)
+        kept -= self._parse_fields(OMIT_PARAM, fields) or set()
+        return {name: field for name, field in fields.items() if name in kept}
+
+    def get_sparse_columns(self):
+        """Колонки, которые остаются в запросе при любом ?fields=."""
+        return ()
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.sparse_fields is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in list(target.fields):
+                if name not in self.sparse_fields:
+                    del target.fields[name]
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.sparse_fields is None:
+            return queryset
+        return narrow_queryset(
+            queryset, self.sparse_fields.values(), self.get_sparse_columns()
+        )
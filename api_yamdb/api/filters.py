@@ -1,13 +1,37 @@
-from django_filters.rest_framework import FilterSet, CharFilter
+from django_filters.rest_framework import (CharFilter, FilterSet,
+                                           IsoDateTimeFilter)
 
-from reviews.models import Title
+from reviews.models import Comment, Review, Title
 
 
 class TitleFilter(FilterSet):
     name = CharFilter(field_name='name', lookup_expr='icontains')
     genre = CharFilter(field_name='genre__slug')
     category = CharFilter(field_name='category__slug')
+    updated_since = IsoDateTimeFilter(
+        field_name='updated_at', lookup_expr='gte'
+    )
 
     class Meta:
         model = Title
-        fields = ('name', 'genre', 'year', 'category')
+        fields = ('name', 'genre', 'year', 'category', 'updated_since')
+
+
+class ReviewFilter(FilterSet):
+    updated_since = IsoDateTimeFilter(
+        field_name='updated_at', lookup_expr='gte'
+    )
+
+    class Meta:
+        model = Review
+        fields = ('updated_since',)
+
+
+class CommentFilter(FilterSet):
+    updated_since = IsoDateTimeFilter(
+        field_name='updated_at', lookup_expr='gte'
+    )
+
+    class Meta:
+        model = Comment
+        fields = ('updated_since',)
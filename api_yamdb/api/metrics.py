@@ -0,0 +1,124 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+SQL_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self):
+        """Накопительные значения бакетов в формате Prometheus."""
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield str(bound), total
+        yield '+Inf', self.count
+
+
+class SQLCounter:
+    """Обёртка connection.execute_wrapper: считает запросы и их время."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class MetricsRegistry:
+    """Метрики запросов по маршруту (titles-list, reviews-detail, ...)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.requests = defaultdict(int)
+            self.latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+            self.sizes = defaultdict(lambda: Histogram(SIZE_BUCKETS))
+            self.sql_queries = defaultdict(lambda: Histogram(SQL_BUCKETS))
+            self.sql_duration = defaultdict(float)
+
+    def observe(self, route, method, status, duration, size, sql):
+        labels = (route, method)
+        with self._lock:
+            self.requests[(route, method, status)] += 1
+            self.latency[labels].observe(duration)
+            if size is not None:
+                self.sizes[labels].observe(size)
+            self.sql_queries[labels].observe(sql.count)
+            self.sql_duration[labels] += sql.duration
+
+    def _histogram(self, name, help_text, histograms):
+        yield f'# HELP {name} {help_text}'
+        yield f'# TYPE {name} histogram'
+        for (route, method), histogram in sorted(histograms.items()):
+            labels = f'route="{route}",method="{method}"'
+            for bound, value in histogram.samples():
+                yield f'{name}_bucket{{{labels},le="{bound}"}} {value}'
+            yield f'{name}_sum{{{labels}}} {histogram.sum}'
+            yield f'{name}_count{{{labels}}} {histogram.count}'
+
+    def render(self):
+        """Текстовый формат Prometheus 0.0.4."""
+        with self._lock:
+            lines = [
+                '# HELP api_requests_total Количество запросов.',
+                '# TYPE api_requests_total counter',
+            ]
+            for (route, method, status), value in sorted(
+                    self.requests.items()):
+                lines.append(
+                    f'api_requests_total{{route="{route}",method="{method}",'
+                    f'status="{status}"}} {value}'
+                )
+            lines.extend(self._histogram(
+                'api_request_duration_seconds',
+                'Время обработки запроса.', self.latency
+            ))
+            lines.extend(self._histogram(
+                'api_response_size_bytes',
+                'Размер тела ответа.', self.sizes
+            ))
+            lines.extend(self._histogram(
+                'api_sql_queries',
+                'Количество SQL-запросов на запрос.', self.sql_queries
+            ))
+            lines.extend([
+                '# HELP api_sql_duration_seconds_total '
+                'Суммарное время SQL-запросов.',
+                '# TYPE api_sql_duration_seconds_total counter',
+            ])
+            for (route, method), value in sorted(self.sql_duration.items()):
+                lines.append(
+                    'api_sql_duration_seconds_total'
+                    f'{{route="{route}",method="{method}"}} {value}'
+                )
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
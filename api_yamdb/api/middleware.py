@@ -0,0 +1,83 @@
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from .metrics import SQLCounter, registry
+from .profiling import is_admin, profile_request, requested_mode
+from .slow_queries import SlowQueryWrapper
+
+
+class MetricsMiddleware:
+    """
+    Собирает метрики запроса для /api/v1/metrics: время, размер ответа,
+    число и время SQL-запросов. Маршрут — имя url (titles-list и т.п.).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sql = SQLCounter()
+        started = time.perf_counter()
+        with connection.execute_wrapper(sql):
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+        match = request.resolver_match
+        registry.observe(
+            route=match.url_name if match else 'unmatched',
+            method=request.method,
+            status=response.status_code,
+            duration=duration,
+            size=None if response.streaming else len(response.content),
+            sql=sql,
+        )
+        return response
+
+
+class SlowQueryMiddleware:
+    """Журнал медленных SQL-запросов, см. api.slow_queries."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        threshold = settings.SLOW_QUERY_THRESHOLD
+        if threshold is None:
+            return self.get_response(request)
+        with connection.execute_wrapper(
+                SlowQueryWrapper(request, threshold)):
+            return self.get_response(request)
+
+
+class ProfilingMiddleware:
+    """
+    Профилирует запрос администратора с `?profile=1` или заголовком
+    X-Profile (`memory` — ещё и tracemalloc). Без флага ничего не делает.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = requested_mode(request)
+        if not mode or not is_admin(request):
+            return self.get_response(request)
+        return profile_request(request, self.get_response, mode)
+
+
+class RateLimitHeadersMiddleware:
+    """Добавляет в ответ заголовки X-RateLimit-* от api.throttling."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        rate_limit = getattr(request, 'rate_limit', None)
+        if rate_limit is not None:
+            limit, remaining, reset = rate_limit
+            response['X-RateLimit-Limit'] = str(limit)
+            response['X-RateLimit-Remaining'] = str(remaining)
+            response['X-RateLimit-Reset'] = str(reset)
+        return response
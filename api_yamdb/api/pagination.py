@@ -0,0 +1,92 @@
+from collections import OrderedDict
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+CURSOR_MODE_PARAM = 'pagination'
+CURSOR_MODE = 'cursor'
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Keyset-пагинация по id: непрозрачный курсор вместо OFFSET, без COUNT(*).
+    Стоимость страницы не зависит от её глубины.
+    """
+    ordering = 'id'
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+
+class ReverseIdCursorPagination(IdCursorPagination):
+    """Keyset-пагинация в порядке Meta.ordering отзывов и комментариев."""
+    ordering = '-id'
+
+
+class CursorPaginationMixin:
+    """
+    Включает курсорную пагинацию по параметру ?pagination=cursor.
+    Ссылки next/previous сохраняют параметр, поэтому режим не сбрасывается.
+    """
+    cursor_pagination_class = None
+
+    @property
+    def paginator(self):
+        if (
+            not hasattr(self, '_paginator')
+            and self.cursor_pagination_class is not None
+            and self.request is not None
+            and self.request.query_params.get(CURSOR_MODE_PARAM)
+            == CURSOR_MODE
+        ):
+            self._paginator = self.cursor_pagination_class()
+        return super().paginator
+
+
+class SincePagination(BasePagination):
+    """
+    Лента по возрастанию id: ?since=<id последней полученной записи>.
+    Клиент хранит since и забирает только новые записи.
+    """
+    since_query_param = 'since'
+    limit_query_param = 'limit'
+    default_limit = 100
+    max_limit = 1000
+
+    def _get_int(self, request, param, default):
+        value = request.query_params.get(param, default)
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            raise ValidationError({param: 'Ожидается целое число.'})
+        if value < 0:
+            raise ValidationError({param: 'Ожидается целое число.'})
+        return value
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.since = self._get_int(request, self.since_query_param, 0)
+        self.limit = min(
+            self._get_int(request, self.limit_query_param,
+                          self.default_limit) or self.default_limit,
+            self.max_limit,
+        )
+        self.page = list(
+            queryset.filter(id__gt=self.since).order_by('id')[:self.limit]
+        )
+        return self.page
+
+    def get_paginated_response(self, data):
+        since = self.page[-1].id if self.page else self.since
+        next_url = None
+        if len(self.page) == self.limit:
+            next_url = replace_query_param(
+                self.request.build_absolute_uri(),
+                self.since_query_param, since
+            )
+        return Response(OrderedDict([
+            ('since', since),
+            ('next', next_url),
+            ('results', data),
+        ]))
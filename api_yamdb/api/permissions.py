@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 
 from rest_framework import permissions
@@ -71,3 +72,15 @@ class IsAdminRole(permissions.BasePermission):
             return True
         return (request.user.is_authenticated
                 and request.user.role in self.allowed_user_roles)
+
+
+class IsAdminRoleOrMetricsScraper(IsAdminRole):
+    """
+    Администраторы или сборщик метрик с адреса из METRICS_ALLOWED_IPS.
+    Адрес берётся из REMOTE_ADDR, заголовкам клиента не доверяем.
+    """
+
+    def has_permission(self, request, view):
+        if request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS:
+            return True
+        return super().has_permission(request, view)
@@ -0,0 +1,135 @@
+import cProfile
+import pstats
+import time
+import tracemalloc
+import uuid
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from rest_framework.exceptions import APIException
+
+from .authentication import CachedJWTAuthentication
+from .permissions import IsAdminRole
+
+PROFILE_FLAG = 'profile'
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+MEMORY = 'memory'
+
+
+def _profile_key(profile_id):
+    return f'profile:{profile_id}'
+
+
+def requested_mode(request):
+    """Режим профилирования из `?profile=` или заголовка X-Profile."""
+    return request.GET.get(PROFILE_FLAG) or request.META.get(PROFILE_HEADER)
+
+
+def is_admin(request):
+    """
+    Middleware работает до аутентификации DRF, поэтому JWT проверяется
+    здесь же; сессия администратора тоже подходит.
+    """
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        try:
+            user_auth = CachedJWTAuthentication().authenticate(request)
+        except APIException:
+            return False
+        if user_auth is None:
+            return False
+        user = user_auth[0]
+    return IsAdminRole().has_permission(SimpleNamespace(user=user), None)
+
+
+class SQLTimeline:
+    """Обёртка connection.execute_wrapper: SQL-запросы по времени начала."""
+
+    def __init__(self, started):
+        self.started = started
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'start': start - self.started,
+                'duration': time.perf_counter() - start,
+                'sql': sql,
+            })
+
+
+def top_functions(profiler, limit):
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+    return [
+        {
+            'function': f'{filename}:{line}({name})',
+            'calls': calls,
+            'total': total,
+            'cumulative': cumulative,
+        }
+        for (filename, line, name), (_, calls, total, cumulative, _)
+        in rows[:limit]
+    ]
+
+
+def top_allocations(snapshot, limit):
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ))
+    return [
+        {
+            'site': str(stat.traceback),
+            'size': stat.size,
+            'count': stat.count,
+        }
+        for stat in snapshot.statistics('lineno')[:limit]
+    ]
+
+
+def profile_request(request, get_response, mode):
+    """
+    Выполняет запрос под cProfile (и tracemalloc для режима `memory`),
+    сохраняет отчёт в кэш и возвращает ответ с заголовком X-Profile-Id.
+    """
+    limit = settings.PROFILE_TOP
+    trace_memory = mode == MEMORY and not tracemalloc.is_tracing()
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    timeline = SQLTimeline(started)
+    profiler = cProfile.Profile()
+    with connection.execute_wrapper(timeline):
+        profiler.enable()
+        try:
+            response = get_response(request)
+        finally:
+            profiler.disable()
+    duration = time.perf_counter() - started
+    allocations = None
+    if trace_memory:
+        allocations = top_allocations(tracemalloc.take_snapshot(), limit)
+        tracemalloc.stop()
+
+    profile_id = uuid.uuid4().hex
+    cache.set(_profile_key(profile_id), {
+        'id': profile_id,
+        'method': request.method,
+        'path': request.get_full_path(),
+        'status': response.status_code,
+        'duration': duration,
+        'functions': top_functions(profiler, limit),
+        'allocations': allocations,
+        'sql': timeline.queries,
+    }, settings.PROFILE_CACHE_TIMEOUT)
+    response['X-Profile-Id'] = profile_id
+    return response
+
+
+def get_profile(profile_id):
+    return cache.get(_profile_key(profile_id))
@@ -1,11 +1,15 @@
 from django.contrib.auth import get_user_model
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
+from django.utils.crypto import get_random_string
 
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from reviews.models import Title, Genre, Category, Comment, Review
+from reviews.models import (Title, Genre, Category, ChangeLog, Comment,
+                            Review)
 
 User = get_user_model()
 
@@ -32,11 +36,19 @@ class UserMeSerializer(serializers.ModelSerializer):
 
 
 class ConfirmationCodeSerializer(serializers.ModelSerializer):
-    """Cериализатор для отпраки confirm_code."""
+    """
+    Cериализатор для отпраки confirm_code.
+    Уникальность username и email проверяется одним запросом в validate:
+    повторная регистрация той же пары username/email разрешена.
+    """
 
     class Meta:
         model = User
         fields = ('username', 'email',)
+        extra_kwargs = {
+            'username': {'validators': [UnicodeUsernameValidator()]},
+            'email': {'validators': []},
+        }
 
     def validate_username(self, value):
         if value == 'me':
@@ -45,6 +57,44 @@ class ConfirmationCodeSerializer(serializers.ModelSerializer):
             )
         return value
 
+    def validate(self, data):
+        users = list(User.objects.filter(
+            Q(username=data['username']) | Q(email=data['email'])
+        )[:2])
+        errors = {}
+        for user in users:
+            if user.username == data['username'] and (
+                    user.email != data['email']):
+                errors['username'] = [
+                    'Пользователь с таким username уже существует.'
+                ]
+            if user.email == data['email'] and (
+                    user.username != data['username']):
+                errors['email'] = [
+                    'Пользователь с таким email уже существует.'
+                ]
+        if errors:
+            raise serializers.ValidationError(errors)
+        self.instance = users[0] if users else None
+        return data
+
+    def save(self, **kwargs):
+        """
+        Создаёт или обновляет пользователя одной записью в базу.
+        Код случайный для каждой регистрации: make_token до INSERT
+        давал всем новым пользователям за день один и тот же код.
+        """
+        user = self.instance or User(**self.validated_data)
+        user.confirmation_code = get_random_string(
+            User._meta.get_field('confirmation_code').max_length
+        )
+        if self.instance is None:
+            user.save(force_insert=True)
+        else:
+            user.save(update_fields=('confirmation_code',))
+        self.instance = user
+        return user
+
 
 class CustomTokenObtainPairSerializer(serializers.Serializer):
     """Проверяет confirmation_code и username."""
@@ -53,7 +103,7 @@ class CustomTokenObtainPairSerializer(serializers.Serializer):
 
     def validate(self, data):
         user = get_object_or_404(
-            User,
+            User.objects.only('id', 'username', 'confirmation_code'),
             username=data['username']
         )
         if user.confirmation_code != data['confirmation_code']:
@@ -87,8 +137,7 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         request = self.context['request']
-        view = self.context['view']
-        title = get_object_or_404(Title, pk=view.kwargs.get('title_pk'))
+        title = self.context['view'].get_title()
         if request.method == 'POST':
             if Review.objects.filter(
                     title=title, author=request.user).exists():
@@ -96,7 +145,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         return data
 
     class Meta:
-        fields = '__all__'
+        fields = ('id', 'author', 'title', 'text', 'score', 'pub_date')
         read_only_fields = ('title', 'author')
         model = Review
 
@@ -116,7 +165,7 @@ class GenreSerializer(serializers.ModelSerializer):
 class TitleSerializer(serializers.ModelSerializer):
     genre = GenreSerializer(read_only=True, many=True)
     category = CategorySerializer(read_only=True)
-    rating = serializers.SerializerMethodField()
+    rating = serializers.FloatField(read_only=True)
 
     class Meta:
         model = Title
@@ -124,16 +173,6 @@ class TitleSerializer(serializers.ModelSerializer):
             'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
         )
 
-    def get_rating(self, obj):
-        sumOfScore = 0
-        try:
-            reviews = obj.reviews.all()
-            for review in reviews:
-                sumOfScore += review.score
-            return sumOfScore / len(reviews)
-        except ZeroDivisionError:
-            return None
-
 
 class TitleCreateSerializer(serializers.ModelSerializer):
     category = serializers.SlugRelatedField(
@@ -150,3 +189,9 @@ class TitleCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Title
         fields = ('id', 'name', 'year', 'description', 'genre', 'category')
+
+
+class ChangeLogSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ChangeLog
+        fields = ('id', 'model', 'object_id', 'action', 'created_at')
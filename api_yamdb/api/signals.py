@@ -0,0 +1,94 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save)
+from django.dispatch import receiver
+
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            deleting_title_ids)
+
+from .authentication import user_cache
+from .cache import CATEGORIES, GENRES, TITLES, invalidate
+
+User = get_user_model()
+
+
+# Жанры и категории выводятся в произведениях.
+CATALOG_SCOPES = {
+    Title: (TITLES,),
+    Genre: (GENRES, TITLES),
+    Category: (CATEGORIES, TITLES),
+}
+
+
+def invalidate_catalog(sender, **kwargs):
+    invalidate(*CATALOG_SCOPES[sender])
+
+
+for model in CATALOG_SCOPES:
+    post_save.connect(invalidate_catalog, sender=model)
+    post_delete.connect(invalidate_catalog, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, action, **kwargs):
+    if action.startswith('post_'):
+        invalidate(TITLES)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def invalidate_title_reviews(sender, instance, **kwargs):
+    # Название произведения выводится в каждом отзыве.
+    invalidate(f'reviews:{instance.pk}')
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_reviews(sender, instance, **kwargs):
+    if instance.title_id in deleting_title_ids():
+        # Версии меняет само удаляемое произведение.
+        return
+    invalidate(TITLES, f'reviews:{instance.title_id}')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comments(sender, instance, **kwargs):
+    invalidate(f'comments:{instance.review_id}')
+
+
+@receiver(post_init, sender=User)
+def remember_username(sender, instance, **kwargs):
+    instance._initial_username = instance.__dict__.get('username')
+
+
+# Поля, которые не выводятся в /api/v1/users/: их запись не меняет версию.
+HIDDEN_USER_FIELDS = frozenset(('confirmation_code', 'last_login'))
+
+
+@receiver(post_save, sender=User)
+def invalidate_users(sender, instance, created, update_fields, **kwargs):
+    if update_fields and HIDDEN_USER_FIELDS.issuperset(update_fields):
+        return
+    scopes = ['users']
+    if not created and instance.username != instance._initial_username:
+        # username автора выводится в отзывах и комментариях.
+        scopes.append('authors')
+    invalidate(*scopes)
+    instance._initial_username = instance.username
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user(sender, instance, **kwargs):
+    invalidate('users')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_authenticated_user(sender, instance, **kwargs):
+    pk = instance.pk
+    user_cache.delete(pk)
+    # Повторно после фиксации: до неё другой запрос мог закэшировать
+    # старую версию пользователя.
+    transaction.on_commit(lambda: user_cache.delete(pk))
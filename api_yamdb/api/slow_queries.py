@@ -0,0 +1,118 @@
+import logging
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+
+logger = logging.getLogger('api.slow_queries')
+
+LITERALS = re.compile(
+    r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s|\?"
+)
+IN_LISTS = re.compile(r'\bIN \((?:\?, )*\?\)')
+SPACES = re.compile(r'\s+')
+
+
+def normalize(sql):
+    """Форма запроса без значений: литералы и параметры заменены на `?`."""
+    sql = LITERALS.sub('?', sql)
+    sql = IN_LISTS.sub('IN (...)', sql)
+    return SPACES.sub(' ', sql).strip()
+
+
+def explain(connection, sql, params):
+    """
+    План запроса. Курсор создаётся в обход execute_wrapper, чтобы EXPLAIN
+    не попадал в журнал и метрики и не сбрасывал результат исходного курсора.
+    """
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    prefix = connection.ops.explain_query_prefix()
+    cursor = connection.create_cursor()
+    try:
+        cursor.execute(f'{prefix} {sql}', params)
+        return ' | '.join(str(row[-1]) for row in cursor.fetchall())
+    except DatabaseError:
+        return None
+    finally:
+        cursor.close()
+
+
+class SlowQueryLog:
+    """Самые медленные формы запросов: не больше `size` штук в памяти."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.shapes = {}
+
+    def record(self, sql, params, duration, view, action, plan):
+        shape = normalize(sql)
+        size = settings.SLOW_QUERY_TOP
+        with self._lock:
+            entry = self.shapes.get(shape)
+            if entry is None:
+                if len(self.shapes) >= size:
+                    fastest = min(
+                        self.shapes.values(), key=lambda item: item['max']
+                    )
+                    if fastest['max'] >= duration:
+                        return
+                    del self.shapes[fastest['shape']]
+                entry = self.shapes[shape] = {
+                    'shape': shape, 'count': 0, 'total': 0.0, 'max': 0.0,
+                }
+            entry['count'] += 1
+            entry['total'] += duration
+            if duration >= entry['max']:
+                entry.update(
+                    max=duration, sql=sql, params=repr(params),
+                    view=view, action=action, plan=plan,
+                )
+
+    def top(self):
+        with self._lock:
+            entries = [dict(entry) for entry in self.shapes.values()]
+        return sorted(entries, key=lambda item: item['max'], reverse=True)
+
+
+slow_queries = SlowQueryLog()
+
+
+class SlowQueryWrapper:
+    """
+    Обёртка connection.execute_wrapper: пишет в журнал запросы дольше
+    SLOW_QUERY_THRESHOLD секунд вместе с планом и view, откуда они пришли.
+    """
+
+    def __init__(self, request, threshold):
+        self.request = request
+        self.threshold = threshold
+
+    def origin(self):
+        match = getattr(self.request, 'resolver_match', None)
+        if match is None:
+            return None, None
+        actions = getattr(match.func, 'actions', None) or {}
+        return match.view_name, actions.get(self.request.method.lower())
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - started
+        if duration >= self.threshold:
+            view, action = self.origin()
+            plan = None if many else explain(
+                context['connection'], sql, params
+            )
+            logger.warning(
+                'Slow query %.3fs in %s (%s): %s; params=%r; plan=%s',
+                duration, view, action, sql, params, plan
+            )
+            slow_queries.record(sql, params, duration, view, action, plan)
+        return result
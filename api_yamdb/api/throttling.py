@@ -0,0 +1,121 @@
+from django.contrib.auth import get_user_model
+from rest_framework.throttling import SimpleRateThrottle
+
+User = get_user_model()
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Скользящее окно из двух счётчиков: текущего и предыдущего окна.
+    Оценка числа запросов: prev * доля_предыдущего_окна + current.
+    В кэше два целых числа на клиента вместо списка временных меток,
+    счётчики увеличиваются атомарным cache.incr.
+    """
+    cache_format = 'throttle_%(scope)s_%(ident)s'
+
+    def _window_key(self, window):
+        return f'{self.key}_{window}'
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.elapsed = self.now - window * self.duration
+        current_key = self._window_key(window)
+        counts = self.cache.get_many(
+            [self._window_key(window - 1), current_key]
+        )
+        self.previous = counts.get(self._window_key(window - 1), 0)
+        self.current = counts.get(current_key, 0)
+
+        allowed = self._estimate() < self.num_requests
+        if allowed:
+            # Ключ живёт два окна: в следующем он станет предыдущим.
+            self.cache.add(current_key, 0, self.duration * 2)
+            try:
+                self.current = self.cache.incr(current_key)
+            except ValueError:
+                self.cache.set(current_key, 1, self.duration * 2)
+                self.current = 1
+        self._store_rate_limit(request)
+        return allowed
+
+    def _estimate(self):
+        weight = (self.duration - self.elapsed) / self.duration
+        return self.previous * weight + self.current
+
+    def _store_rate_limit(self, request):
+        """Запоминает лимит для заголовков X-RateLimit-* ответа."""
+        remaining = max(int(self.num_requests - self._estimate()), 0)
+        rate_limit = (
+            self.num_requests, remaining,
+            int(self.duration - self.elapsed) + 1,
+        )
+        stored = getattr(request._request, 'rate_limit', None)
+        if stored is None or remaining < stored[1]:
+            request._request.rate_limit = rate_limit
+
+    def wait(self):
+        """Секунды до того, как оценка опустится ниже лимита."""
+        if self.current >= self.num_requests:
+            # В текущем окне лимит исчерпан: ждём следующего, где
+            # нынешний счётчик станет предыдущим и начнёт убывать.
+            return (
+                self.duration - self.elapsed
+                + self.duration * (1 - self.num_requests / self.current)
+            )
+        # Лимит исчерпан за счёт предыдущего окна, его вес убывает.
+        needed = self.duration * (
+            1 - (self.num_requests - self.current) / self.previous
+        )
+        return max(needed - self.elapsed, 0)
+
+
+class RoleRateThrottle(SlidingWindowRateThrottle):
+    """Отдельные лимиты для анонимов и ролей user, moderator и admin."""
+
+    def __init__(self):
+        # Скоуп и лимит зависят от пользователя и выбираются в запросе.
+        self.rate = None
+
+    def get_scope(self, user):
+        if not user.is_authenticated:
+            return 'anon'
+        if user.is_superuser:
+            return User.ADMIN
+        return user.role
+
+    def allow_request(self, request, view):
+        self.scope = self.get_scope(request.user)
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        if request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class ClientRateThrottle(SlidingWindowRateThrottle):
+    """Лимит по IP клиента для эндпоинтов регистрации и выдачи токена."""
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope, 'ident': self.get_ident(request)
+        }
+
+
+class SignupRateThrottle(ClientRateThrottle):
+    scope = 'signup'
+
+
+class TokenRateThrottle(ClientRateThrottle):
+    scope = 'token'
@@ -1,9 +1,11 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework import routers
-from .views import (CategoryViewSet, GenreViewSet, CommentViewSet,
+from .views import (CategoryViewSet, ChangeLogViewSet, GenreViewSet,
+                    CommentViewSet,
                     ReviewViewSet, TitleViewSet, UserViewSet,
                     SignupConfirmationCodeSend,
-                    CustomTokenObtainPairView)
+                    CustomTokenObtainPairView, ExportView, MetricsView,
+                    ProfileView, SlowQueriesView)
 
 app_name = 'api'
 
@@ -14,6 +16,7 @@ router.register(r'categories', CategoryViewSet,
                 basename='categories')
 router.register(r'genres', GenreViewSet,
                 basename='genres')
+router.register(r'changes', ChangeLogViewSet, basename='changes')
 router.register(r'titles', TitleViewSet,
                 basename='titles')
 router.register(r'titles/(?P<title_pk>\d+)/reviews',
@@ -29,5 +32,12 @@ urlpatterns = [
     path('v1/auth/signup/', SignupConfirmationCodeSend.as_view()),
     path('v1/auth/token/', CustomTokenObtainPairView.as_view(),
          name='token_obtain_pair'),
+    re_path(r'^v1/export/(?P<dataset>\w+)\.(?P<extension>\w+)$',
+            ExportView.as_view(), name='export'),
+    path('v1/metrics', MetricsView.as_view(), name='metrics'),
+    path('v1/slow-queries/', SlowQueriesView.as_view(),
+         name='slow_queries'),
+    path('v1/profiles/<str:profile_id>/', ProfileView.as_view(),
+         name='profile'),
     path('v1/', include(router.urls)),
 ]
@@ -1,14 +1,16 @@
-from django.core.mail import send_mail
+from users.models import EmailOutbox
 
 from api_yamdb.settings import DEFAULT_FROM_EMAIL
 
 
 def send_confirmation_code(email, confirmation_code):
-    """Функция для отправки email"""
-    send_mail(
-        'confirmation_code for registration',
-        f'Check out your confirmation_code: {confirmation_code}',
-        DEFAULT_FROM_EMAIL,
-        [email],
-        fail_silently=False,
+    """
+    Ставит письмо с кодом в очередь EmailOutbox.
+    Письмо отправляет команда send_outbox, запрос её не ждёт.
+    """
+    EmailOutbox.objects.create(
+        recipient=email,
+        subject='confirmation_code for registration',
+        body=f'Check out your confirmation_code: {confirmation_code}',
+        from_email=DEFAULT_FROM_EMAIL,
     )
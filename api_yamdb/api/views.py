@@ -1,10 +1,13 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth.tokens import default_token_generator
+from django.db import IntegrityError, transaction
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -12,13 +15,28 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
 
-from reviews.models import Title, Genre, Category, Review
+from reviews.export import DATASETS, EXPORTERS, FORMATS
+from reviews.models import Title, Genre, Category, ChangeLog, Review
 
-from .filters import TitleFilter
+from .cache import (CATEGORIES, GENRES, TITLES, CachedListMixin,
+                    CachedRetrieveMixin)
+from .compiled import CompiledReadMixin
+from .conditional import ConditionalGetMixin
+from .expand import ExpandMixin, latest_children
+from .fieldsets import SparseFieldsetMixin
+from .filters import CommentFilter, ReviewFilter, TitleFilter
+from .metrics import registry
+from .pagination import (CursorPaginationMixin, IdCursorPagination,
+                         ReverseIdCursorPagination, SincePagination)
+from .profiling import get_profile
+from .slow_queries import slow_queries
 from .utils import send_confirmation_code
 from .permissions import (IsAdminOrReadOnly, IsOwnerAdminModeratorOrReadOnly,
-                          IsAdminRole)
-from .serializers import (CategorySerializer, GenreSerializer,
+                          IsAdminRole, IsAdminRoleOrMetricsScraper)
+from .throttling import (RoleRateThrottle, SignupRateThrottle,
+                         TokenRateThrottle)
+from .serializers import (CategorySerializer, ChangeLogSerializer,
+                          GenreSerializer,
                           CommentSerializer,
                           ReviewSerializer, TitleSerializer,
                           TitleCreateSerializer,
@@ -30,9 +48,11 @@ from .serializers import (CategorySerializer, GenreSerializer,
 User = get_user_model()
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalGetMixin, SparseFieldsetMixin,
+                  viewsets.ModelViewSet):
     """Viewset для модели User."""
     queryset = User.objects.all()
+    version_scopes = ('users',)
     serializer_class = UserSerializer
     permission_classes = (IsAdminRole,)
     lookup_field = "username"
@@ -62,26 +82,77 @@ class SignupConfirmationCodeSend(APIView):
     Отсылает confirmation_code по email и записывает его в модель User.
     """
     permission_classes = (AllowAny,)
-
-    def _generate_and_send_token(self, user):
-        user.confirmation_code = default_token_generator.make_token(user)
-        send_confirmation_code(user.email, user.confirmation_code)
-        user.save()
+    throttle_classes = (RoleRateThrottle, SignupRateThrottle)
 
     def post(self, request):
         serializer = ConfirmationCodeSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        user = get_object_or_404(
-            User, username=serializer.data['username']
-        )
-        self._generate_and_send_token(user)
+        # Пользователь и письмо в очереди сохраняются вместе или никак.
+        try:
+            with transaction.atomic():
+                user = serializer.save()
+                send_confirmation_code(user.email, user.confirmation_code)
+        except IntegrityError:
+            # Параллельная регистрация успела занять username или email.
+            raise ValidationError(
+                'Пользователь с таким username или email уже существует.'
+            )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class ExportView(APIView):
+    """
+    Потоково выгружает набор данных в csv или ndjson.
+    Файлы в формате csv читаются командой csv_import.
+    """
+    permission_classes = (IsAdminRole,)
+
+    def get(self, request, dataset, extension):
+        if dataset not in DATASETS or extension not in EXPORTERS:
+            raise Http404
+        response = StreamingHttpResponse(
+            EXPORTERS[extension](dataset), content_type=FORMATS[extension]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{dataset}.{extension}"'
+        )
+        return response
+
+
+class MetricsView(APIView):
+    """Метрики запросов в текстовом формате Prometheus."""
+    permission_classes = (IsAdminRoleOrMetricsScraper,)
+
+    def get(self, request):
+        return HttpResponse(
+            registry.render(),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+
+
+class SlowQueriesView(APIView):
+    """Самые медленные формы SQL-запросов с планами выполнения."""
+    permission_classes = (IsAdminRole,)
+
+    def get(self, request):
+        return Response(slow_queries.top())
+
+
+class ProfileView(APIView):
+    """Отчёт профилирования по id из заголовка X-Profile-Id."""
+    permission_classes = (IsAdminRole,)
+
+    def get(self, request, profile_id):
+        profile = get_profile(profile_id)
+        if profile is None:
+            raise Http404
+        return Response(profile)
+
+
 class CustomTokenObtainPairView(TokenObtainPairView):
     """Возвращает JSON web token."""
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_classes = (RoleRateThrottle, TokenRateThrottle)
 
 
 class ListCreateDestroyViewSet(mixins.ListModelMixin, mixins.CreateModelMixin,
@@ -90,8 +161,10 @@ class ListCreateDestroyViewSet(mixins.ListModelMixin, mixins.CreateModelMixin,
     pass
 
 
-class CategoryViewSet(ListCreateDestroyViewSet):
+class CategoryViewSet(ConditionalGetMixin, CachedListMixin,
+                      SparseFieldsetMixin, ListCreateDestroyViewSet):
     queryset = Category.objects.all()
+    version_scopes = (CATEGORIES,)
     serializer_class = CategorySerializer
     permission_classes = [IsAdminOrReadOnly]
     pagination_class = LimitOffsetPagination
@@ -100,8 +173,10 @@ class CategoryViewSet(ListCreateDestroyViewSet):
     lookup_field = 'slug'
 
 
-class GenreViewSet(ListCreateDestroyViewSet):
+class GenreViewSet(ConditionalGetMixin, CachedListMixin,
+                   SparseFieldsetMixin, ListCreateDestroyViewSet):
     queryset = Genre.objects.all()
+    version_scopes = (GENRES,)
     serializer_class = GenreSerializer
     pagination_class = LimitOffsetPagination
     permission_classes = [IsAdminOrReadOnly]
@@ -110,45 +185,115 @@ class GenreViewSet(ListCreateDestroyViewSet):
     lookup_field = 'slug'
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all()
+class TitleViewSet(ExpandMixin, ConditionalGetMixin, CachedListMixin,
+                   CachedRetrieveMixin, CursorPaginationMixin,
+                   SparseFieldsetMixin, CompiledReadMixin,
+                   viewsets.ModelViewSet):
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
+    serializer_class = TitleSerializer
+    version_scopes = (TITLES,)
     pagination_class = LimitOffsetPagination
+    cursor_pagination_class = IdCursorPagination
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
+    expandable = ('reviews', 'reviews.comments')
+    expand_actions = ('retrieve',)
+    # Название выводится во встроенных отзывах, их количество — в count.
+    expand_columns = {'reviews': ('name', 'reviews_count')}
 
     def get_serializer_class(self):
         if self.request.method in ('POST', 'PATCH'):
             return TitleCreateSerializer
-        return TitleSerializer
+        return super().get_serializer_class()
+
+    def embed(self, titles, items):
+        """?expand=reviews,reviews.comments"""
+        latest = latest_children(
+            Review.objects.select_related('author'), 'title',
+            [title.id for title in titles], settings.EXPAND_LIMIT
+        )
+        for title, item in zip(titles, items):
+            reviews = latest.get(title.id, [])
+            for review in reviews:
+                review.title = title
+            # Количество отзывов хранится в самом произведении.
+            collection = self.embedded(
+                reviews, title.reviews_count, 'api:reviews-list',
+                {'title_pk': title.id},
+            )
+            collection['results'] = self.child_data(
+                ReviewSerializer, reviews
+            )
+            if 'reviews.comments' in self.expand:
+                self.embed_comments(reviews, collection['results'])
+            item['reviews'] = collection
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ExpandMixin, ConditionalGetMixin, CursorPaginationMixin,
+                    SparseFieldsetMixin, CompiledReadMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
+    version_scopes = ('reviews:{title_pk}', 'authors')
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = ReviewFilter
     permission_classes = [IsOwnerAdminModeratorOrReadOnly, ]
+    cursor_pagination_class = ReverseIdCursorPagination
+    expandable = ('comments',)
+    expand_actions = ('list',)
+
+    def get_title(self):
+        """Произведение из url, загружается один раз за запрос."""
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, pk=self.kwargs.get('title_pk')
+            )
+        return self._title
 
     def get_queryset(self):
-        title_pk = self.kwargs.get('title_pk')
-        title = get_object_or_404(Title, id=title_pk)
-        return title.reviews.all()
+        # review.title проставляется менеджером из get_title() без запроса.
+        return self.get_title().reviews.select_related('author')
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, pk=self.kwargs.get('title_pk'))
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author=self.request.user, title=self.get_title())
 
+    def embed(self, reviews, items):
+        """?expand=comments"""
+        self.embed_comments(reviews, items)
 
-class CommentViewSet(viewsets.ModelViewSet):
+
+class CommentViewSet(ConditionalGetMixin, CursorPaginationMixin,
+                     SparseFieldsetMixin, CompiledReadMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
+    version_scopes = ('comments:{review_pk}', 'authors')
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = CommentFilter
     permission_classes = [IsOwnerAdminModeratorOrReadOnly, ]
+    cursor_pagination_class = ReverseIdCursorPagination
+
+    def get_review(self):
+        """Отзыв из url, загружается одним запросом за запрос."""
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review,
+                pk=self.kwargs.get('review_pk'),
+                title_id=self.kwargs.get('title_pk'),
+            )
+        return self._review
 
     def get_queryset(self):
-        review_pk = self.kwargs.get('review_pk')
-        title = get_object_or_404(Title, reviews=review_pk)
-        review = get_object_or_404(Review, id=review_pk, title=title)
-        return review.comments.all()
+        return self.get_review().comments.select_related('author')
 
     def perform_create(self, serializer):
-        review_pk = self.kwargs.get('review_pk')
-        title = get_object_or_404(Title, reviews=review_pk)
-        review = get_object_or_404(Review, pk=review_pk, title=title)
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.get_review())
+
+
+class ChangeLogViewSet(SparseFieldsetMixin, mixins.ListModelMixin,
+                       viewsets.GenericViewSet):
+    """Лента изменений произведений, отзывов и комментариев."""
+    queryset = ChangeLog.objects.all()
+    serializer_class = ChangeLogSerializer
+    pagination_class = SincePagination
@@ -28,16 +28,21 @@ INSTALLED_APPS = [
     'api',
     'reviews',
     'users',
+    'bench',
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.SlowQueryMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'api.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.RateLimitHeadersMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -72,6 +77,37 @@ DATABASES = {
 }
 
 
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api_yamdb',
+    }
+}
+
+CATALOG_CACHE_TIMEOUT = 60 * 10
+
+AUTH_USER_CACHE_SIZE = 1024
+AUTH_USER_CACHE_TTL = 60
+
+# Адреса сборщиков метрик, которым /api/v1/metrics доступен без токена;
+# остальным — только администраторам.
+METRICS_ALLOWED_IPS = ()
+
+# Порог в секундах для журнала медленных запросов (None — выключен)
+# и сколько самых медленных форм запросов держать в памяти.
+SLOW_QUERY_THRESHOLD = 0.1
+SLOW_QUERY_TOP = 20
+
+# Отчёты профилирования (?profile=1): число строк в топах и время хранения.
+PROFILE_TOP = 30
+PROFILE_CACHE_TIMEOUT = 60 * 60
+
+# Сколько дочерних объектов встраивается в ответ по ?expand=.
+EXPAND_LIMIT = 5
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -116,11 +152,27 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
 
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.RoleRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': '100/min',
+        'user': '300/min',
+        'moderator': '600/min',
+        'admin': '1200/min',
+        'signup': '10/hour',
+        'token': '30/hour',
+    },
+    # Число доверенных прокси перед приложением. При 0 лимиты по IP
+    # считаются по REMOTE_ADDR, а подделанный клиентом X-Forwarded-For
+    # не даёт обойти их; за балансировщиком укажите число прокси.
+    'NUM_PROXIES': 0,
 }
 
 SIMPLE_JWT = {
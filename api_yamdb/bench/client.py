@@ -0,0 +1,78 @@
+import io
+import json
+import sys
+import time
+from urllib.parse import urlencode
+
+from django.db import connection
+
+from api.metrics import SQLCounter
+
+
+class WSGIClient:
+    """
+    Вызывает WSGI-приложение в том же процессе, без сети, и записывает
+    для каждого запроса время, число SQL-запросов и статус.
+    """
+
+    def __init__(self, application, samples, token=None):
+        self.application = application
+        self.samples = samples
+        self.token = token
+
+    def _environ(self, method, path, query, body):
+        environ = {
+            'REQUEST_METHOD': method,
+            'SCRIPT_NAME': '',
+            'PATH_INFO': path,
+            'QUERY_STRING': urlencode(query or {}),
+            'SERVER_NAME': 'testserver',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'REMOTE_ADDR': '127.0.0.1',
+            'CONTENT_TYPE': 'application/json',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        if self.token:
+            environ['HTTP_AUTHORIZATION'] = f'Bearer {self.token}'
+        return environ
+
+    def request(self, label, method, path, query=None, data=None):
+        """Возвращает статус и разобранный json ответа."""
+        body = json.dumps(data).encode() if data is not None else b''
+        environ = self._environ(method, path, query, body)
+        response_status = []
+
+        def start_response(status, headers, exc_info=None):
+            response_status.append(int(status.split()[0]))
+
+        sql = SQLCounter()
+        started = time.perf_counter()
+        with connection.execute_wrapper(sql):
+            result = self.application(environ, start_response)
+            try:
+                content = b''.join(result)
+            finally:
+                # close() отправляет request_finished, как настоящий сервер.
+                if hasattr(result, 'close'):
+                    result.close()
+        elapsed = time.perf_counter() - started
+        status = response_status[0]
+        self.samples.append((label, elapsed, sql.count, status))
+        try:
+            return status, json.loads(content) if content else None
+        except ValueError:
+            return status, None
+
+    def get(self, label, path, query=None):
+        return self.request(label, 'GET', path, query)
+
+    def post(self, label, path, data):
+        return self.request(label, 'POST', path, data=data)
@@ -0,0 +1,137 @@
+import datetime
+import json
+import platform
+import subprocess
+from contextlib import nullcontext
+
+import django
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import connection
+
+from ...runner import compare, run_scenario, throttling_disabled
+from ...scenarios import SCENARIOS, BenchContext
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+            text=True, check=True, cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs load-test scenarios against the WSGI application in-process "
+        "and saves latency, throughput and SQL statistics as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scenario', action='append', choices=sorted(SCENARIOS),
+            help='Сценарий; можно указать несколько раз (по умолчанию все).'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=4,
+            help='Число параллельных потоков.'
+        )
+        parser.add_argument(
+            '--duration', type=float, default=10,
+            help='Длительность каждого сценария в секундах.'
+        )
+        parser.add_argument(
+            '--iterations', type=int, default=0,
+            help='Шагов сценария на поток вместо --duration.'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Зерно выбора произведений, фильтров и оценок.'
+        )
+        parser.add_argument(
+            '--output', default='bench.json',
+            help='Файл с результатами.'
+        )
+        parser.add_argument(
+            '--compare', metavar='BASELINE',
+            help='Сравнить с результатами предыдущего запуска.'
+        )
+        parser.add_argument(
+            '--throttle', action='store_true',
+            help='Не отключать лимиты запросов.'
+        )
+
+    def _print(self, name, result):
+        if not result['requests']:
+            self.stdout.write(f'{name}: no requests completed')
+            return
+        latency = result['latency_ms']
+        self.stdout.write(
+            f'{name}: {result["requests"]} requests, '
+            f'{result["errors"]} errors, {result["throughput"]:.1f} req/s, '
+            f'p50 {latency["p50"]:.1f} ms, p95 {latency["p95"]:.1f} ms, '
+            f'p99 {latency["p99"]:.1f} ms, '
+            f'{result["queries_per_request"]["mean"]:.1f} queries/request'
+        )
+
+    def handle(self, *args, **options):
+        # Приложение из api_yamdb/wsgi.py — то же, что у сервера.
+        # api_yamdb/asgi.py импортирует django.core.asgi, которого нет
+        # в Django 2.2, поэтому ASGI-приложение нагрузить нельзя.
+        from api_yamdb.wsgi import application
+
+        context = BenchContext()
+        names = options['scenario'] or list(SCENARIOS)
+        for name in names:
+            for attribute in SCENARIOS[name].requires:
+                if not getattr(context, attribute):
+                    raise CommandError(
+                        f'Scenario "{name}" needs data in the database, '
+                        'run generate_dataset first'
+                    )
+
+        report = {
+            'started': datetime.datetime.now(
+                datetime.timezone.utc
+            ).isoformat(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'debug': settings.DEBUG,
+            'options': {
+                key: options[key] for key in (
+                    'concurrency', 'duration', 'iterations', 'seed',
+                    'throttle',
+                )
+            },
+            'scenarios': {},
+        }
+        for name in names:
+            self.stdout.write(f'Running {name}')
+            limits = (
+                nullcontext() if options['throttle'] else throttling_disabled()
+            )
+            with limits:
+                result = run_scenario(
+                    application, SCENARIOS[name], context,
+                    options['concurrency'], duration=options['duration'],
+                    iterations=options['iterations'], seed=options['seed'],
+                )
+            report['scenarios'][name] = result
+            self._print(name, result)
+
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            json.dump(report, output, ensure_ascii=False, indent=2)
+        self.stdout.write(f'Results saved to {options["output"]}')
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as baseline:
+                rows = compare(json.load(baseline), report)
+            for name, metric, before, after, change in rows:
+                change = '' if change is None else f' ({change:+.1f}%)'
+                self.stdout.write(
+                    f'{name} {metric}: {before:.2f} -> {after:.2f}{change}'
+                )
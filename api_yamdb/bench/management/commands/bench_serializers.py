@@ -0,0 +1,69 @@
+import json
+
+from django.core.management import BaseCommand, CommandError
+
+from ...serializers import CASES, SIZES, regressions, run
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures Title, Review and Comment serializers on in-memory "
+        "objects and checks them against a stored baseline"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--serializer', action='append', choices=sorted(CASES),
+            help='Сериализатор; можно указать несколько раз '
+                 '(по умолчанию все).'
+        )
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=list(SIZES),
+            help='Количество объектов в одном вызове.'
+        )
+        parser.add_argument(
+            '--min-time', type=float, default=1.0,
+            help='Сколько секунд повторять замер скорости.'
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для результатов; его можно взять базовым.'
+        )
+        parser.add_argument(
+            '--baseline',
+            help='Результаты, с которыми сравнивается запуск.'
+        )
+        parser.add_argument(
+            '--max-slowdown', type=float, default=0.2,
+            help='Допустимое замедление относительно базы (0.2 = 20%%).'
+        )
+        parser.add_argument(
+            '--max-allocation-growth', type=float, default=0.1,
+            help='Допустимый рост пика памяти на объект.'
+        )
+
+    def handle(self, *args, **options):
+        results = run(
+            options['serializer'], options['sizes'], options['min_time']
+        )
+        for name, sizes in results.items():
+            for size, result in sizes.items():
+                self.stdout.write(
+                    f'{name}[{size}]: {result["objects_per_sec"]:.0f} '
+                    f'objects/s, {result["peak_bytes_per_object"]:.0f} '
+                    f'bytes/object'
+                )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(results, output, indent=2)
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as baseline:
+                failed = list(regressions(
+                    json.load(baseline), results, options['max_slowdown'],
+                    options['max_allocation_growth'],
+                ))
+            if failed:
+                raise CommandError(
+                    'Serializer regressions:\n' + '\n'.join(failed)
+                )
+            self.stdout.write('No regressions against the baseline')
@@ -0,0 +1,123 @@
+import math
+import random
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.db import connection
+
+from api.throttling import SlidingWindowRateThrottle
+
+from .client import WSGIClient
+
+
+def percentile(values, percent):
+    """Процентиль по ближайшему рангу для отсортированного списка."""
+    if not values:
+        return None
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(sample[1] * 1000 for sample in samples)
+    queries = [sample[2] for sample in samples]
+    statuses = Counter(str(sample[3]) for sample in samples)
+    return {
+        'requests': len(samples),
+        'errors': sum(sample[3] >= 400 for sample in samples),
+        'throughput': len(samples) / elapsed if elapsed else 0,
+        'latency_ms': {
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'mean': sum(latencies) / len(latencies) if latencies else None,
+            'max': latencies[-1] if latencies else None,
+        },
+        'queries_per_request': {
+            'mean': sum(queries) / len(queries) if queries else None,
+            'max': max(queries, default=None),
+        },
+        'statuses': dict(sorted(statuses.items())),
+    }
+
+
+@contextmanager
+def throttling_disabled():
+    """Лимиты запросов не должны ограничивать нагрузочный тест."""
+    rates = SlidingWindowRateThrottle.THROTTLE_RATES
+    SlidingWindowRateThrottle.THROTTLE_RATES = dict.fromkeys(rates)
+    try:
+        yield
+    finally:
+        SlidingWindowRateThrottle.THROTTLE_RATES = rates
+
+
+def run_scenario(application, scenario_class, context, concurrency,
+                 duration=None, iterations=None, seed=0):
+    """
+    Выполняет сценарий в concurrency потоках: iterations шагов в каждом
+    или, если iterations не задано, в течение duration секунд.
+    """
+    samples = [[] for _ in range(concurrency)]
+    deadline = None
+
+    def worker(index):
+        rng = random.Random(f'{seed}:{scenario_class.name}:{index}')
+        client = WSGIClient(application, samples[index])
+        try:
+            scenario = scenario_class(context, client, rng, index)
+            steps = 0
+            while (
+                steps < iterations if iterations
+                else time.perf_counter() < deadline
+            ):
+                scenario.step()
+                steps += 1
+        finally:
+            # У каждого потока своё соединение с базой.
+            connection.close()
+
+    started = time.perf_counter()
+    deadline = started + (duration or 0)
+    with ThreadPoolExecutor(concurrency) as pool:
+        for future in [pool.submit(worker, i) for i in range(concurrency)]:
+            future.result()
+    elapsed = time.perf_counter() - started
+
+    flat = [sample for worker in samples for sample in worker]
+    by_label = defaultdict(list)
+    for sample in flat:
+        by_label[sample[0]].append(sample)
+    result = summarize(flat, elapsed)
+    result['elapsed'] = elapsed
+    result['endpoints'] = {
+        label: summarize(label_samples, elapsed)
+        for label, label_samples in sorted(by_label.items())
+    }
+    return result
+
+
+COMPARED = (
+    ('throughput', ('throughput',)),
+    ('p50', ('latency_ms', 'p50')),
+    ('p95', ('latency_ms', 'p95')),
+    ('p99', ('latency_ms', 'p99')),
+    ('queries', ('queries_per_request', 'mean')),
+)
+
+
+def compare(baseline, current):
+    """Строки (сценарий, метрика, было, стало, изменение в %)."""
+    for name, result in current['scenarios'].items():
+        old = baseline.get('scenarios', {}).get(name)
+        if old is None:
+            continue
+        for metric, path in COMPARED:
+            before, after = old, result
+            for key in path:
+                before, after = before.get(key), after.get(key)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before * 100 if before else None
+            yield name, metric, before, after, change
@@ -0,0 +1,172 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db.models import Max, Min
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import Category, Genre, Review, Title
+
+User = get_user_model()
+
+API = '/api/v1'
+
+
+class BenchContext:
+    """Данные из базы, общие для всех сценариев одного запуска."""
+
+    def __init__(self, hot_titles=20, hot_reviews=200):
+        # Уникальная метка запуска: пользователи прошлых запусков не мешают.
+        self.run = uuid.uuid4().hex[:8]
+        self.title_ids = list(Title.objects.values_list('id', flat=True))
+        self.genres = list(Genre.objects.values_list('slug', flat=True))
+        self.categories = list(
+            Category.objects.values_list('slug', flat=True)
+        )
+        years = Title.objects.aggregate(first=Min('year'), last=Max('year'))
+        self.years = (years['first'], years['last'])
+        hot = Title.objects.order_by('-reviews_count').values_list(
+            'id', flat=True
+        )[:hot_titles]
+        self.hot_reviews = list(
+            Review.objects.filter(title_id__in=list(hot)).order_by(
+                '-id'
+            ).values_list('title_id', 'id')[:hot_reviews]
+        )
+
+    def create_user(self, name):
+        """Новый пользователь сценария и его access-токен."""
+        user = User.objects.create(
+            username=f'bench_{self.run}_{name}',
+            email=f'bench_{self.run}_{name}@yamdb.fake',
+        )
+        return str(AccessToken.for_user(user))
+
+
+class Scenario:
+    """
+    Сценарий одного потока: step() выполняет несколько запросов через
+    client, который сам записывает их время и число SQL-запросов.
+    """
+    name = None
+    # Атрибуты BenchContext, без которых сценарий не запустить.
+    requires = ('title_ids',)
+
+    def __init__(self, context, client, rng, worker):
+        self.context = context
+        self.client = client
+        self.rng = rng
+        self.worker = worker
+
+    def step(self):
+        raise NotImplementedError
+
+
+class CatalogScenario(Scenario):
+    """Просмотр каталога с фильтрами, карточки произведения и отзывов."""
+    name = 'catalog'
+
+    def step(self):
+        context, rng = self.context, self.rng
+        query = {}
+        if context.genres and rng.random() < 0.5:
+            query['genre'] = rng.choice(context.genres)
+        if context.categories and rng.random() < 0.5:
+            query['category'] = rng.choice(context.categories)
+        if rng.random() < 0.3:
+            query['year'] = rng.randint(*context.years)
+        self.client.get('titles-list', f'{API}/titles/', query)
+        title = rng.choice(context.title_ids)
+        self.client.get('titles-detail', f'{API}/titles/{title}/')
+        self.client.get('reviews-list', f'{API}/titles/{title}/reviews/')
+        if rng.random() < 0.2:
+            self.client.get('genres-list', f'{API}/genres/')
+
+
+class ReviewScenario(Scenario):
+    """Публикация отзывов и чтение пересчитанного рейтинга."""
+    name = 'reviews'
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.users = 0
+        self.titles = iter(())
+
+    def next_title(self):
+        # Пользователь оценивает произведение один раз: когда произведения
+        # закончились, отзывы пишет следующий пользователь.
+        for title in self.titles:
+            return title
+        self.users += 1
+        self.client.token = self.context.create_user(
+            f'review_{self.worker}_{self.users}'
+        )
+        titles = list(self.context.title_ids)
+        self.rng.shuffle(titles)
+        self.titles = iter(titles)
+        return next(self.titles)
+
+    def step(self):
+        title = self.next_title()
+        self.client.post(
+            'reviews-create', f'{API}/titles/{title}/reviews/',
+            {'text': 'Отзыв из нагрузочного теста',
+             'score': self.rng.randint(1, 10)}
+        )
+        self.client.get('titles-detail', f'{API}/titles/{title}/')
+
+
+class CommentScenario(Scenario):
+    """Ветки комментариев к отзывам популярных произведений."""
+    name = 'comments'
+    requires = ('hot_reviews',)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.client.token = self.context.create_user(f'comment_{self.worker}')
+
+    def step(self):
+        title, review = self.rng.choice(self.context.hot_reviews)
+        reviews_url = f'{API}/titles/{title}/reviews/'
+        comments_url = f'{reviews_url}{review}/comments/'
+        self.client.get('reviews-list', reviews_url, {'pagination': 'cursor'})
+        self.client.get('comments-list', comments_url)
+        self.client.post(
+            'comments-create', comments_url,
+            {'text': 'Комментарий из нагрузочного теста'}
+        )
+
+
+class AuthScenario(Scenario):
+    """Регистрация и получение токена по коду подтверждения."""
+    name = 'auth'
+    requires = ()
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.signups = 0
+
+    def step(self):
+        self.signups += 1
+        username = f'bench_{self.context.run}_{self.worker}_{self.signups}'
+        status, _ = self.client.post(
+            'signup', f'{API}/auth/signup/',
+            {'username': username, 'email': f'{username}@yamdb.fake'}
+        )
+        if status != 200:
+            return
+        # Код приходит письмом; здесь он читается из базы вне замера.
+        code = User.objects.values_list(
+            'confirmation_code', flat=True
+        ).get(username=username)
+        self.client.post(
+            'token', f'{API}/auth/token/',
+            {'username': username, 'confirmation_code': code}
+        )
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        CatalogScenario, ReviewScenario, CommentScenario, AuthScenario
+    )
+}
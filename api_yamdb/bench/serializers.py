@@ -0,0 +1,154 @@
+import datetime
+import gc
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleSerializer)
+from reviews.models import Category, Comment, Genre, Review, Title
+
+User = get_user_model()
+
+SIZES = (10, 1000, 100000)
+PUB_DATE = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def prefetched(instance, name, objects):
+    """Кладёт связанные объекты в кэш prefetch_related без запроса к базе."""
+    queryset = getattr(instance, name).model.objects.all()
+    queryset._result_cache = list(objects)
+    queryset._prefetch_done = True
+    instance._prefetched_objects_cache = {name: queryset}
+    return instance
+
+
+def build_titles(count):
+    categories = [
+        Category(id=pk, name=f'Категория {pk}', slug=f'category-{pk}')
+        for pk in range(1, 6)
+    ]
+    genres = [
+        Genre(id=pk, name=f'Жанр {pk}', slug=f'genre-{pk}')
+        for pk in range(1, 11)
+    ]
+    return [
+        prefetched(
+            Title(
+                id=pk, name=f'Произведение {pk}', year=2000, rating=7.5,
+                description='Описание' if pk % 2 else None,
+                category=categories[pk % len(categories)],
+            ),
+            'genre', genres[pk % 8:pk % 8 + 2],
+        )
+        for pk in range(1, count + 1)
+    ]
+
+
+def _authors():
+    return [
+        User(id=pk, username=f'user{pk}', email=f'user{pk}@yamdb.fake')
+        for pk in range(1, 101)
+    ]
+
+
+def build_reviews(count):
+    authors = _authors()
+    titles = build_titles(10)
+    return [
+        Review(
+            id=pk, title=titles[pk % 10], author=authors[pk % 100],
+            text='Текст отзыва', score=pk % 10 + 1,
+            pub_date=PUB_DATE, updated_at=PUB_DATE,
+        )
+        for pk in range(1, count + 1)
+    ]
+
+
+def build_comments(count):
+    authors = _authors()
+    return [
+        Comment(
+            id=pk, review_id=1, author=authors[pk % 100],
+            text='Текст комментария', pub_date=PUB_DATE, updated_at=PUB_DATE,
+        )
+        for pk in range(1, count + 1)
+    ]
+
+
+CASES = {
+    'title': (TitleSerializer, build_titles),
+    'review': (ReviewSerializer, build_reviews),
+    'comment': (CommentSerializer, build_comments),
+}
+
+
+def measure(serializer_class, instances, min_time=1.0):
+    """
+    Скорость: лучший из повторов, которых набирается на min_time секунд.
+    Память: пик tracemalloc за один отдельный прогон.
+    """
+    serializer_class(instances, many=True).data
+    timings = []
+    # Как в timeit: сборщик мусора не вмешивается в замер.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while sum(timings) < min_time:
+            started = time.perf_counter()
+            serializer_class(instances, many=True).data
+            timings.append(time.perf_counter() - started)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        serializer_class(instances, many=True).data
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'objects_per_sec': len(instances) / min(timings),
+        'peak_bytes_per_object': peak / len(instances),
+        'rounds': len(timings),
+    }
+
+
+def run(cases=None, sizes=SIZES, min_time=1.0):
+    results = {}
+    for name in cases or CASES:
+        serializer_class, build = CASES[name]
+        results[name] = {
+            str(size): measure(serializer_class, build(size), min_time)
+            for size in sizes
+        }
+    return results
+
+
+def regressions(baseline, results, max_slowdown, max_allocation_growth):
+    """Замеры, которые хуже базовых больше допустимого."""
+    for name, sizes in results.items():
+        for size, current in sizes.items():
+            base = baseline.get(name, {}).get(size)
+            if base is None:
+                continue
+            slowdown = 1 - current['objects_per_sec'] / base['objects_per_sec']
+            if slowdown > max_slowdown:
+                yield (
+                    f'{name}[{size}]: {current["objects_per_sec"]:.0f} '
+                    f'objects/s, baseline {base["objects_per_sec"]:.0f} '
+                    f'({slowdown:.0%} slower)'
+                )
+            growth = (
+                current['peak_bytes_per_object']
+                / base['peak_bytes_per_object'] - 1
+            )
+            if growth > max_allocation_growth:
+                yield (
+                    f'{name}[{size}]: {current["peak_bytes_per_object"]:.0f} '
+                    f'bytes/object, baseline '
+                    f'{base["peak_bytes_per_object"]:.0f} '
+                    f'({growth:.0%} more)'
+                )
@@ -0,0 +1,44 @@
+"""
+Шаги после загрузки данных в обход сигналов моделей: csv_import
+и generate_dataset пишут строки напрямую, поэтому журнал изменений,
+рейтинг и версии api.cache обновляются здесь.
+"""
+from django.db import transaction
+
+from .models import ChangeLog, Comment, DataVersion, Review, Title
+
+# Модели, изменения которых попадают в /api/v1/changes/.
+LOGGED_MODELS = (Title, Review, Comment)
+BATCH_SIZE = 500
+
+
+def log_saved(model, object_ids):
+    """Пишет в журнал сохранение объектов, загруженных без сигналов."""
+    if model not in LOGGED_MODELS:
+        return
+    ChangeLog.objects.bulk_create(
+        (
+            ChangeLog(
+                model=model._meta.model_name, object_id=object_id,
+                action=ChangeLog.SAVE
+            )
+            for object_id in object_ids
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+def finish_bulk_load():
+    """
+    Пересчитывает рейтинг произведений, у которых он разошёлся
+    с отзывами, пишет их в журнал и меняет версии всех областей.
+    """
+    title_ids = list(
+        Title.objects.with_stale_rating().values_list('pk', flat=True)
+    )
+    with transaction.atomic():
+        for start in range(0, len(title_ids), BATCH_SIZE):
+            batch = title_ids[start:start + BATCH_SIZE]
+            Title.objects.filter(pk__in=batch).recalculate_rating()
+            log_saved(Title, batch)
+        DataVersion.objects.bump(DataVersion.BULK_LOAD)
@@ -0,0 +1,151 @@
+import datetime
+import random
+
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+PHRASES = (
+    'Отличное произведение', 'Смотрел дважды', 'Слишком затянуто',
+    'Сильный финал', 'Не моё', 'Рекомендую друзьям', 'Актёры на высоте',
+    'Сюжет предсказуем', 'Перечитаю ещё раз', 'Музыка понравилась',
+    'Ожидал большего', 'Лучшее за год',
+)
+STARTED = datetime.datetime(2015, 1, 1, tzinfo=datetime.timezone.utc)
+PERIOD = 10 * 365 * 24 * 60 * 60
+
+
+class DatasetGenerator:
+    """
+    Детерминированный синтетический каталог. Строки каждого набора
+    совпадают по колонкам с reviews.export.DATASETS, поэтому их можно
+    и записать в базу, и выгрузить в csv для csv_import.
+
+    Число отзывов на произведение распределено по Ципфу: несколько очень
+    популярных произведений и длинный хвост. Комментарии тоже
+    сосредоточены на небольшой части отзывов.
+    """
+
+    def __init__(self, users, categories, genres, titles, reviews, comments,
+                 seed=0, zipf=1.1):
+        if reviews > titles * users:
+            raise ValueError(
+                'Each user can review a title only once: '
+                f'reviews must not exceed titles * users ({titles * users})'
+            )
+        if comments and not reviews:
+            raise ValueError('Comments need at least one review')
+        if titles and not categories:
+            raise ValueError('Titles need at least one category')
+        self.counts = {
+            'users': users, 'category': categories, 'genre': genres,
+            'titles': titles, 'review': reviews, 'comments': comments,
+        }
+        self.seed = seed
+        self.zipf = zipf
+        rng = self._random('texts')
+        self.texts = [
+            '. '.join(rng.sample(PHRASES, rng.randint(1, 3))) + '.'
+            for _ in range(256)
+        ]
+
+    def _random(self, dataset):
+        # Свой генератор на каждый набор: наборы не зависят друг от друга.
+        return random.Random(f'{self.seed}:{dataset}')
+
+    def _text(self, rng):
+        return self.texts[rng.getrandbits(8)]
+
+    def _date(self, rng):
+        return STARTED + datetime.timedelta(seconds=rng.randrange(PERIOD))
+
+    def reviews_per_title(self):
+        """Число отзывов по id произведения: закон Ципфа по рангу."""
+        titles, users = self.counts['titles'], self.counts['users']
+        total = self.counts['review']
+        if not titles:
+            return []
+        ranks = list(range(titles))
+        self._random('ranks').shuffle(ranks)
+        weights = [1 / (rank + 1) ** self.zipf for rank in ranks]
+        scale = total / sum(weights)
+        counts = [min(users, int(weight * scale)) for weight in weights]
+        # Остаток после округления отдаётся самым популярным, пока не
+        # закончатся пользователи, которые их ещё не оценили.
+        by_rank = sorted(range(titles), key=ranks.__getitem__)
+        remainder = total - sum(counts)
+        while remainder:
+            for index in by_rank:
+                if not remainder:
+                    break
+                if counts[index] < users:
+                    counts[index] += 1
+                    remainder -= 1
+        return counts
+
+    def users(self):
+        rng = self._random('users')
+        for pk in range(1, self.counts['users'] + 1):
+            role = rng.choices(
+                (User.USER, User.MODERATOR, User.ADMIN), (980, 18, 2)
+            )[0]
+            yield (pk, f'user{pk}', f'user{pk}@yamdb.fake', role, '', '', '')
+
+    def category(self):
+        for pk in range(1, self.counts['category'] + 1):
+            yield pk, f'Категория {pk}', f'category-{pk}'
+
+    def genre(self):
+        for pk in range(1, self.counts['genre'] + 1):
+            yield pk, f'Жанр {pk}', f'genre-{pk}'
+
+    def titles(self):
+        rng = self._random('titles')
+        this_year = datetime.date.today().year
+        for pk in range(1, self.counts['titles'] + 1):
+            category = rng.randint(1, self.counts['category'])
+            description = self._text(rng) if rng.random() < 0.5 else None
+            yield (
+                pk, f'Произведение {pk}', rng.randint(1900, this_year),
+                category, description,
+            )
+
+    def genre_title(self):
+        rng = self._random('genre_title')
+        genres = self.counts['genre']
+        pk = 0
+        for title in range(1, self.counts['titles'] + 1):
+            for genre in rng.sample(
+                    range(1, genres + 1), min(genres, rng.randint(1, 3))):
+                pk += 1
+                yield pk, title, genre
+
+    def review(self):
+        rng = self._random('review')
+        users = range(1, self.counts['users'] + 1)
+        pk = 0
+        for title, count in enumerate(self.reviews_per_title(), 1):
+            # У каждого произведения своё «качество», оценки вокруг него.
+            quality = rng.uniform(3, 9)
+            for author in rng.sample(users, count):
+                pk += 1
+                score = min(10, max(1, round(rng.gauss(quality, 1.5))))
+                yield (
+                    pk, title, self._text(rng), author, score,
+                    self._date(rng),
+                )
+
+    def comments(self):
+        rng = self._random('comments')
+        reviews, users = self.counts['review'], self.counts['users']
+        for pk in range(1, self.counts['comments'] + 1):
+            # Степенное распределение: большая часть комментариев
+            # приходится на небольшую долю отзывов.
+            review = int(reviews * rng.random() ** 3) + 1
+            yield (
+                pk, review, self._text(rng), rng.randint(1, users),
+                self._date(rng),
+            )
+
+    def rows(self, dataset):
+        return getattr(self, dataset)()
@@ -0,0 +1,85 @@
+import csv
+import json
+
+from django.contrib.auth import get_user_model
+
+from .models import Category, Comment, Genre, Review, Title
+
+User = get_user_model()
+
+# Имена наборов совпадают с файлами, которые читает csv_import,
+# колонки — с заголовками этих файлов.
+DATASETS = {
+    'users': (
+        User,
+        ('id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'),
+        ('id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'),
+    ),
+    'category': (Category, ('id', 'name', 'slug'), ('id', 'name', 'slug')),
+    'genre': (Genre, ('id', 'name', 'slug'), ('id', 'name', 'slug')),
+    'titles': (
+        Title,
+        ('id', 'name', 'year', 'category', 'description'),
+        ('id', 'name', 'year', 'category_id', 'description'),
+    ),
+    'review': (
+        Review,
+        ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+        ('id', 'title_id', 'text', 'author_id', 'score', 'pub_date'),
+    ),
+    'comments': (
+        Comment,
+        ('id', 'review_id', 'text', 'author', 'pub_date'),
+        ('id', 'review_id', 'text', 'author_id', 'pub_date'),
+    ),
+    'genre_title': (
+        Title.genre.through,
+        ('id', 'title_id', 'genre_id'),
+        ('id', 'title_id', 'genre_id'),
+    ),
+}
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+
+class Echo:
+    """Псевдофайл для csv.writer: writerow возвращает готовую строку."""
+
+    def write(self, value):
+        return value
+
+
+def csv_value(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def export_rows(dataset, chunk_size=2000):
+    """Строки набора по возрастанию id, без загрузки всей таблицы."""
+    model, _, columns = DATASETS[dataset]
+    rows = model.objects.order_by('id').values_list(*columns).iterator(
+        chunk_size=chunk_size
+    )
+    for row in rows:
+        yield [csv_value(value) for value in row]
+
+
+def export_csv(dataset, chunk_size=2000):
+    writer = csv.writer(Echo())
+    yield writer.writerow(DATASETS[dataset][1])
+    for row in export_rows(dataset, chunk_size):
+        yield writer.writerow(row)
+
+
+def export_ndjson(dataset, chunk_size=2000):
+    header = DATASETS[dataset][1]
+    for row in export_rows(dataset, chunk_size):
+        yield json.dumps(dict(zip(header, row)), ensure_ascii=False) + '\n'
+
+
+EXPORTERS = {'csv': export_csv, 'ndjson': export_ndjson}
@@ -0,0 +1,115 @@
+import csv
+import io
+from contextlib import contextmanager
+from itertools import islice
+
+
+def read_csv_chunks(path, chunk_size, offset=0):
+    """
+    Построчно читает csv-файл и отдаёт пары (строки, смещение), где строк
+    не больше chunk_size, а смещение — байт сразу после последней из них.
+    Чтение можно продолжить с сохранённого смещения.
+    """
+    with open(path, 'rb') as csvfile:
+        header = csvfile.readline().decode('utf-8-sig')
+        fieldnames = next(csv.reader([header]))
+        csvfile.seek(max(offset, csvfile.tell()))
+        position = csvfile.tell()
+
+        def lines():
+            # csv.reader забирает строки только до конца записи, поэтому
+            # position всегда указывает на границу записи.
+            nonlocal position
+            for line in csvfile:
+                position += len(line)
+                yield line.decode('utf-8')
+
+        reader = csv.DictReader(lines(), fieldnames=fieldnames)
+        while True:
+            chunk = list(islice(reader, chunk_size))
+            if not chunk:
+                return
+            yield chunk, position
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    """Сохраняет даты из csv в полях auto_now_add (например, pub_date)."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def read_csv_header(path):
+    """Возвращает имена колонок и смещение первой записи."""
+    with open(path, 'rb') as csvfile:
+        header = csvfile.readline().decode('utf-8-sig')
+        return next(csv.reader([header])), csvfile.tell()
+
+
+def split_csv_records(path, start, records_per_range):
+    """
+    Делит файл с байта start на диапазоны по records_per_range записей.
+    Граница записи — перевод строки при чётном числе кавычек с начала
+    записи, поэтому многострочные поля в кавычках не разрезаются.
+    """
+    with open(path, 'rb') as csvfile:
+        csvfile.seek(start)
+        position = range_start = start
+        records = quotes = 0
+        for line in csvfile:
+            position += len(line)
+            quotes += line.count(b'"')
+            if quotes % 2:
+                continue
+            quotes = 0
+            records += 1
+            if records == records_per_range:
+                yield range_start, position
+                range_start = position
+                records = 0
+        if position > range_start:
+            yield range_start, position
+
+
+def read_csv_range(path, start, end, fieldnames):
+    """Читает записи из байтового диапазона [start, end)."""
+    with open(path, 'rb') as csvfile:
+        csvfile.seek(start)
+        data = csvfile.read(end - start).decode('utf-8')
+    return list(csv.DictReader(
+        io.StringIO(data, newline=''), fieldnames=fieldnames
+    ))
+
+
+_worker_command = None
+
+
+def init_worker(known_ids):
+    """Готовит процесс пула: Django и карты id для проверки ключей."""
+    global _worker_command
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+    from .csv_import import Command
+
+    _worker_command = Command()
+    _worker_command.known_ids = known_ids
+
+
+def parse_range(csvfile, path, start, end, fieldnames):
+    """Разбирает и проверяет диапазон файла в процессе пула."""
+    rows = read_csv_range(path, start, end, fieldnames)
+    model = _worker_command.csvfile_to_model()[csvfile]
+    objects, rejects = _worker_command._build(model, rows)
+    return objects, rejects, len(rows), end
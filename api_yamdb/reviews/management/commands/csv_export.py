@@ -0,0 +1,43 @@
+import os
+import time
+
+from django.core.management import BaseCommand
+
+from ...export import DATASETS, EXPORTERS
+
+
+class Command(BaseCommand):
+    help = "Exports the catalog to csv or ndjson files readable by csv_import"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output_dir',
+            help='Каталог, в который записываются файлы.'
+        )
+        parser.add_argument(
+            '--format', choices=sorted(EXPORTERS), default='csv',
+            help='Формат файлов.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Количество строк, читаемых из базы за один раз.'
+        )
+
+    def handle(self, *args, **options):
+        os.makedirs(options['output_dir'], exist_ok=True)
+        exporter = EXPORTERS[options['format']]
+        for dataset in DATASETS:
+            path = os.path.join(
+                options['output_dir'], f'{dataset}.{options["format"]}'
+            )
+            started = time.monotonic()
+            lines = 0
+            with open(path, 'w', encoding='utf-8', newline='') as output:
+                for line in exporter(dataset, options['chunk_size']):
+                    output.write(line)
+                    lines += 1
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'Exported {dataset} to {path} in {elapsed:.2f}s '
+                f'({lines} lines)'
+            )
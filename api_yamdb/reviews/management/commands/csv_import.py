@@ -1,21 +1,32 @@
+import csv
+import json
 import os
-
-from csv import DictReader
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from django.core.management import BaseCommand
+from django.core.validators import MaxLengthValidator
+from django.db import IntegrityError, connections, transaction
+from django.utils import timezone
 
 from api_yamdb.settings import BASE_DIR
 
-from ...models import Category, Genre, Title, Review, Comment
+from ...bulk import finish_bulk_load, log_saved
+from ...models import (Category, Genre, ImportCheckpoint, Title, Review,
+                       Comment)
+from ._private import (init_worker, keep_auto_now_add, parse_range,
+                       read_csv_chunks, read_csv_header, split_csv_records)
 
 User = get_user_model()
+TitleGenre = Title.genre.through
 
 ALREDY_LOADED_ERROR_MESSAGE = """
 If you need to reload the data from the CSV files,
-first delete the db.sqlite3 file to destroy the database.
-Then, run `python3 manage.py migrate --run-syncdb` for a new empty
-database with tables"""
+run the command with --upsert to merge rows by primary key,
+or with --resume to continue an interrupted import."""
 
 
 class Command(BaseCommand):
@@ -27,75 +38,301 @@ class Command(BaseCommand):
         Title: 'titles.csv',
         Review: 'review.csv',
         Comment: 'comments.csv',
-        'Title m2m Genre': 'genre_title.csv',
+        TitleGenre: 'genre_title.csv',
+    }
+    # Поля, которые приходят из csv: проверяются и обновляются в --upsert.
+    model_to_fields = {
+        User: ('username', 'email', 'role', 'bio', 'first_name', 'last_name'),
+        Category: ('name', 'slug'),
+        Genre: ('name', 'slug'),
+        Title: ('name', 'year', 'category', 'description'),
+        Review: ('title', 'text', 'author', 'score', 'pub_date'),
+        Comment: ('review', 'text', 'author', 'pub_date'),
+        TitleGenre: ('title', 'genre'),
     }
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Количество строк в одном bulk_create и транзакции.'
+        )
+        parser.add_argument(
+            '--data-dir', default=os.path.join(BASE_DIR, 'static/data'),
+            help='Каталог с csv-файлами.'
+        )
+        parser.add_argument(
+            '--upsert', action='store_true',
+            help='Обновлять существующие строки по первичному ключу.'
+        )
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Продолжить прерванный импорт с сохранённых смещений.'
+        )
+        parser.add_argument(
+            '--reject-file', default='csv_import_rejects.csv',
+            help='Файл для строк, не прошедших проверку.'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=0,
+            help='Число процессов для разбора и проверки csv. '
+                 'Запись в базу всегда идёт из одного процесса.'
+        )
+
+    @classmethod
+    def csvfile_to_model(cls):
+        return {
+            csvfile: model for model, csvfile in cls.model_to_csvfile.items()
+        }
+
+    def _fk(self, model, value):
+        """Проверяет внешний ключ по карте загруженных id."""
+        pk = int(value)
+        if pk not in self.known_ids[model]:
+            raise ValueError(f'{model.__name__} with id={pk} not found')
+        return pk
+
     def _create_model_object(self, model, row):
         if model == User:
-            model_object = model(
-                id=row['id'],
+            return model(
+                id=int(row['id']),
                 username=row['username'],
                 email=row['email'], role=row['role'],
                 bio=row['bio'],
-                first_name=['first_name'],
-                last_name=['last_name']
-            )
-            model_object.save()
-        if model == Category:
-            model_object = model(
-                id=row['id'],
-                name=row['name'],
-                slug=row['slug']
+                first_name=row['first_name'],
+                last_name=row['last_name']
             )
-            model_object.save()
-        if model == Genre:
-            model_object = model(
-                id=row['id'],
+        if model in (Category, Genre):
+            return model(
+                id=int(row['id']),
                 name=row['name'],
                 slug=row['slug']
             )
-            model_object.save()
         if model == Title:
-            model_object = model(
-                id=row['id'], name=row['name'],
-                year=row['year'],
-                category=Category.objects.get(id=row['category'])
+            return model(
+                id=int(row['id']), name=row['name'],
+                year=int(row['year']),
+                category_id=self._fk(Category, row['category']),
+                description=row.get('description') or None
             )
-            model_object.save()
         if model == Review:
-            model_object = model(
-                id=row['id'],
-                title=Title.objects.get(id=row['title_id']),
+            return model(
+                id=int(row['id']),
+                title_id=self._fk(Title, row['title_id']),
                 text=row['text'],
-                author=User.objects.get(id=row['author']),
-                score=row['score'],
+                author_id=self._fk(User, row['author']),
+                score=int(row['score']),
                 pub_date=row['pub_date']
             )
-            model_object.save()
         if model == Comment:
-            model_object = model(
-                id=row['id'],
-                review=Review.objects.get(id=row['review_id']),
+            return model(
+                id=int(row['id']),
+                review_id=self._fk(Review, row['review_id']),
                 text=row['text'],
-                author=User.objects.get(id=row['author']),
+                author_id=self._fk(User, row['author']),
                 pub_date=row['pub_date']
             )
-            model_object.save()
-        if model == 'Title m2m Genre':
-            title_object = Title.objects.get(id=row['title_id'])
-            title_object.genre.add(row['genre_id'])
+        return model(
+            id=int(row['id']),
+            title_id=self._fk(Title, row['title_id']),
+            genre_id=self._fk(Genre, row['genre_id'])
+        )
 
-    def handle(self, *args, **options):
-        for model in self.model_to_csvfile.keys():
-            if model != 'Title m2m Genre' and model.objects.exists():
-                print(
-                    f'"{model.__name__} model" data already loaded...exiting.'
+    def _validate(self, model, obj):
+        """
+        Проверяет поля из csv валидаторами модели. Внешние ключи уже
+        проверены по карте id (ForeignKey.validate сделал бы запрос на
+        каждую строку), а длину текста SQLite не ограничивает, и прежний
+        импорт её не проверял.
+        """
+        for name in self.model_to_fields[model]:
+            field = model._meta.get_field(name)
+            if field.is_relation:
+                continue
+            value = field.to_python(getattr(obj, field.attname))
+            if value is None and field.null:
+                continue
+            field.validate(value, obj)
+            for validator in field.validators:
+                if not isinstance(validator, MaxLengthValidator):
+                    validator(value)
+            setattr(obj, field.attname, value)
+
+    def _reject(self, csvfile, row, error):
+        if self.reject_writer is None:
+            self.reject_file = open(
+                self.reject_path, 'a', encoding='utf-8', newline=''
+            )
+            self.reject_writer = csv.writer(self.reject_file)
+        self.reject_writer.writerow(
+            [csvfile, error, json.dumps(row, ensure_ascii=False)]
+        )
+        self.rejected += 1
+
+    def _build(self, model, rows):
+        """Возвращает пары (объект, строка) и отбракованные строки."""
+        objects = []
+        rejects = []
+        for row in rows:
+            try:
+                obj = self._create_model_object(model, row)
+                self._validate(model, obj)
+            except (KeyError, ValueError, ValidationError) as error:
+                if isinstance(error, ValidationError):
+                    error = '; '.join(error.messages)
+                rejects.append((row, str(error)))
+            else:
+                objects.append((obj, row))
+        return objects, rejects
+
+    def _write_batch(self, model, objects, upsert):
+        with keep_auto_now_add(model):
+            self._write_objects(model, objects, upsert)
+
+    def _write_objects(self, model, objects, upsert):
+        if model is TitleGenre:
+            # Связь с жанром — изменение произведения.
+            log_saved(Title, {obj.title_id for obj in objects})
+        else:
+            log_saved(model, [obj.pk for obj in objects])
+        if not upsert:
+            model.objects.bulk_create(objects)
+            return
+        existing = set(model.objects.filter(
+            pk__in=[obj.pk for obj in objects]
+        ).values_list('pk', flat=True))
+        model.objects.bulk_create(
+            [obj for obj in objects if obj.pk not in existing]
+        )
+        to_update = [obj for obj in objects if obj.pk in existing]
+        fields = list(self.model_to_fields[model])
+        if any(field.name == 'updated_at' for field in model._meta.fields):
+            # bulk_update не вызывает pre_save, auto_now ставится вручную.
+            now = timezone.now()
+            for obj in to_update:
+                obj.updated_at = now
+            fields.append('updated_at')
+        model.objects.bulk_update(to_update, fields)
+
+    def _write(self, model, csvfile, objects, upsert):
+        """Пишет пачку целиком, а при ошибке — построчно с отбраковкой."""
+        try:
+            with transaction.atomic():
+                self._write_batch(model, [obj for obj, _ in objects], upsert)
+            return [obj for obj, _ in objects]
+        except IntegrityError:
+            pass
+        written = []
+        for obj, row in objects:
+            try:
+                with transaction.atomic():
+                    self._write_batch(model, [obj], upsert)
+            except IntegrityError as error:
+                self._reject(csvfile, row, str(error))
+            else:
+                written.append(obj)
+        return written
+
+    def _parse(self, model, path, offset, options):
+        for rows, end in read_csv_chunks(path, options['batch_size'], offset):
+            yield (*self._build(model, rows), len(rows), end)
+
+    def _parse_parallel(self, csvfile, path, offset, options):
+        """
+        Разбирает диапазоны файла в пуле процессов и отдаёт результаты
+        по порядку. В работе не больше двух диапазонов на процесс, чтобы
+        память не росла, если запись отстаёт от разбора.
+        """
+        workers = options['workers']
+        fieldnames, header_end = read_csv_header(path)
+        ranges = split_csv_records(
+            path, max(offset, header_end), options['batch_size']
+        )
+        # Соединения с базой не должны переходить в дочерние процессы.
+        connections.close_all()
+        with ProcessPoolExecutor(
+                workers, initializer=init_worker,
+                initargs=(self.known_ids,)) as pool:
+            pending = deque()
+            for start, end in ranges:
+                pending.append(pool.submit(
+                    parse_range, csvfile, path, start, end, fieldnames
+                ))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _load(self, model, csvfile, options):
+        checkpoint, _ = ImportCheckpoint.objects.get_or_create(
+            filename=csvfile
+        )
+        if checkpoint.completed:
+            self.stdout.write('Already loaded, skipping')
+            return
+        started = time.monotonic()
+        loaded = 0
+        path = os.path.join(options['data_dir'], csvfile)
+        if options['workers'] > 0:
+            batches = self._parse_parallel(
+                csvfile, path, checkpoint.offset, options
+            )
+        else:
+            batches = self._parse(model, path, checkpoint.offset, options)
+        for objects, rejects, rows_count, offset in batches:
+            for row, error in rejects:
+                self._reject(csvfile, row, error)
+            with transaction.atomic():
+                written = self._write(
+                    model, csvfile, objects, options['upsert']
                 )
-                print(ALREDY_LOADED_ERROR_MESSAGE)
-                return
-
-        for model, csvfile in self.model_to_csvfile.items():
-            print(f"Loading {str(model)} data")
-            for row in DictReader(
-                    open(os.path.join(BASE_DIR, f'static/data/{csvfile}'))):
-                self._create_model_object(model, row)
+                # Смещение фиксируется в той же транзакции, что и строки.
+                checkpoint.offset = offset
+                checkpoint.rows += rows_count
+                checkpoint.save()
+            if model in self.known_ids:
+                self.known_ids[model].update(obj.id for obj in written)
+            loaded += len(written)
+        checkpoint.completed = True
+        checkpoint.save()
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'Loaded {loaded} rows in {elapsed:.2f}s '
+            f'({loaded / max(elapsed, 1e-6):.0f} rows/s)'
+        )
+
+    def handle(self, *args, **options):
+        if not options['upsert'] and not options['resume']:
+            for model in self.model_to_csvfile.keys():
+                if model.objects.exists():
+                    self.stdout.write(
+                        f'"{model.__name__} model" data already loaded'
+                        '...exiting.'
+                    )
+                    self.stdout.write(ALREDY_LOADED_ERROR_MESSAGE)
+                    return
+        if not options['resume']:
+            ImportCheckpoint.objects.filter(
+                filename__in=self.model_to_csvfile.values()
+            ).delete()
+
+        # Карты id для проверки внешних ключей без запросов к базе.
+        self.known_ids = {
+            model: set(model.objects.values_list('id', flat=True))
+            for model in (User, Category, Genre, Title, Review)
+        }
+        self.rejected = 0
+        self.reject_path = options['reject_file']
+        self.reject_file = self.reject_writer = None
+        try:
+            for model, csvfile in self.model_to_csvfile.items():
+                self.stdout.write(f'Loading {model.__name__} data')
+                self._load(model, csvfile, options)
+        finally:
+            if self.reject_file is not None:
+                self.reject_file.close()
+        finish_bulk_load()
+        if self.rejected:
+            self.stdout.write(
+                f'{self.rejected} rows rejected, '
+                f'see {options["reject_file"]}'
+            )
@@ -0,0 +1,144 @@
+import csv
+import os
+import time
+from itertools import islice
+
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import DateTimeField
+
+from ...bulk import finish_bulk_load, log_saved
+from ...dataset import DatasetGenerator
+from ...export import DATASETS, csv_value
+
+ALREDY_LOADED_ERROR_MESSAGE = """
+The dataset is generated into an empty database only.
+Use --csv to write the files and load them with csv_import --upsert."""
+
+
+class Command(BaseCommand):
+    help = "Generates a deterministic synthetic catalog for load testing"
+
+    def add_arguments(self, parser):
+        for name, default in (
+                ('users', 1000), ('categories', 10), ('genres', 30),
+                ('titles', 1000), ('reviews', 20000), ('comments', 50000)):
+            parser.add_argument(
+                f'--{name}', type=int, default=default,
+                help=f'Количество записей ({default} по умолчанию).'
+            )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Зерно генератора: одно зерно даёт одинаковые данные.'
+        )
+        parser.add_argument(
+            '--zipf', type=float, default=1.1,
+            help='Показатель распределения Ципфа для отзывов.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=10000,
+            help='Количество строк в одном executemany.'
+        )
+        parser.add_argument(
+            '--csv', metavar='DIR',
+            help='Записать csv-файлы для csv_import вместо загрузки в базу.'
+        )
+
+    def _write_csv(self, dataset, rows, output_dir):
+        path = os.path.join(output_dir, f'{dataset}.csv')
+        with open(path, 'w', encoding='utf-8', newline='') as output:
+            writer = csv.writer(output)
+            writer.writerow(DATASETS[dataset][1])
+            count = 0
+            for row in rows:
+                writer.writerow([csv_value(value) for value in row])
+                count += 1
+        return count
+
+    def _write_db(self, dataset, rows, batch_size):
+        """
+        Вставляет строки через executemany: bulk_create тратит большую
+        часть времени на сборку SQL для каждого объекта. Поля, которых
+        нет в наборе (updated_at, date_joined и т.п.), получают значения
+        по умолчанию модели.
+        """
+        model, _, columns = DATASETS[dataset]
+        fields = {
+            field.attname: field for field in model._meta.concrete_fields
+        }
+        template = model()
+        defaults = [
+            (name, field.get_db_prep_save(
+                field.pre_save(template, add=True), connection
+            ))
+            for name, field in fields.items() if name not in columns
+        ]
+        adapters = [
+            connection.ops.adapt_datetimefield_value
+            if isinstance(fields[name], DateTimeField) else None
+            for name in columns
+        ]
+        names = list(columns) + [name for name, _ in defaults]
+        default_values = tuple(value for _, value in defaults)
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            connection.ops.quote_name(model._meta.db_table),
+            ', '.join(
+                connection.ops.quote_name(fields[name].column)
+                for name in names
+            ),
+            ', '.join(['%s'] * len(names)),
+        )
+        count = 0
+        with transaction.atomic(), connection.cursor() as cursor:
+            while True:
+                batch = [
+                    tuple(
+                        adapt(value) if adapt else value
+                        for adapt, value in zip(adapters, row)
+                    ) + default_values
+                    for row in islice(rows, batch_size)
+                ]
+                if not batch:
+                    return count
+                cursor.executemany(sql, batch)
+                # id — первая колонка каждого набора.
+                log_saved(model, [row[0] for row in batch])
+                count += len(batch)
+
+    def handle(self, *args, **options):
+        try:
+            generator = DatasetGenerator(
+                users=options['users'], categories=options['categories'],
+                genres=options['genres'], titles=options['titles'],
+                reviews=options['reviews'], comments=options['comments'],
+                seed=options['seed'], zipf=options['zipf'],
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        output_dir = options['csv']
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        else:
+            for model, _, _ in DATASETS.values():
+                if model.objects.exists():
+                    self.stdout.write(
+                        f'"{model.__name__} model" data already exists'
+                        '...exiting.'
+                    )
+                    self.stdout.write(ALREDY_LOADED_ERROR_MESSAGE)
+                    return
+
+        for dataset in DATASETS:
+            started = time.monotonic()
+            rows = generator.rows(dataset)
+            if output_dir:
+                count = self._write_csv(dataset, rows, output_dir)
+            else:
+                count = self._write_db(dataset, rows, options['batch_size'])
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'Generated {count} {dataset} rows in {elapsed:.2f}s '
+                f'({count / max(elapsed, 1e-6):.0f} rows/s)'
+            )
+        if not output_dir:
+            finish_bulk_load()
@@ -1,7 +1,14 @@
+import threading
+import time
+from contextlib import contextmanager
+
 from django.contrib.auth import get_user_model
 from django.core.validators import (RegexValidator, MaxValueValidator,
                                     MinValueValidator)
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Avg, Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
 from .utils import year_validator
 
 slug_validator_regexp = RegexValidator(
@@ -10,6 +17,27 @@ slug_validator_regexp = RegexValidator(
 )
 User = get_user_model()
 
+_deleting = threading.local()
+
+
+def deleting_title_ids():
+    """pk произведений, которые удаляются в текущем потоке."""
+    return getattr(_deleting, 'title_ids', frozenset())
+
+
+@contextmanager
+def deleting_titles(title_ids):
+    """
+    Помечает удаляемые произведения: сигналы каскадно удаляемых отзывов
+    не пересчитывают их рейтинг и версии.
+    """
+    previous = deleting_title_ids()
+    _deleting.title_ids = previous | frozenset(title_ids)
+    try:
+        yield
+    finally:
+        _deleting.title_ids = previous
+
 
 class Category(models.Model):
     name = models.CharField(
@@ -35,6 +63,39 @@ class Genre(models.Model):
     )
 
 
+def _review_aggregate(expression):
+    """Агрегат по отзывам произведения из внешнего запроса."""
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    return Subquery(reviews.annotate(value=expression).values('value'))
+
+
+class TitleQuerySet(models.QuerySet):
+
+    def recalculate_rating(self):
+        """Пересчитывает рейтинг произведений по таблице отзывов."""
+        return self.update(
+            score_sum=Coalesce(_review_aggregate(Sum('score')), 0),
+            reviews_count=Coalesce(_review_aggregate(Count('id')), 0),
+            rating=_review_aggregate(Avg('score')),
+            updated_at=timezone.now(),
+        )
+
+    def with_stale_rating(self):
+        """Произведения, счётчики рейтинга которых расходятся с отзывами."""
+        return self.annotate(
+            actual_sum=Coalesce(_review_aggregate(Sum('score')), 0),
+            actual_count=Coalesce(_review_aggregate(Count('id')), 0),
+        ).exclude(
+            score_sum=F('actual_sum'), reviews_count=F('actual_count')
+        )
+
+    def delete(self):
+        with deleting_titles(self.values_list('pk', flat=True)):
+            return super().delete()
+
+
 class Title(models.Model):
     name = models.CharField(
         max_length=150,
@@ -52,6 +113,16 @@ class Title(models.Model):
         null=True
     )
 
+    score_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0
+    )
+
+    reviews_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0
+    )
+
     description = models.CharField(
         max_length=1000,
         verbose_name='Описание произведения',
@@ -72,6 +143,35 @@ class Title(models.Model):
         related_name='titles',
     )
 
+    updated_at = models.DateTimeField(
+        db_index=True,
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
+
+    objects = TitleQuerySet.as_manager()
+
+    # Поля рейтинга пишутся только сигналами reviews.signals.
+    RATING_FIELDS = ('rating', 'score_sum', 'reviews_count')
+
+    def save(self, *args, **kwargs):
+        """Не затирает рейтинг устаревшими значениями при обновлении."""
+        if (
+            not self._state.adding
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+        ):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with deleting_titles((self.pk,)):
+            return super().delete(*args, **kwargs)
+
 
 class Review(models.Model):
     title = models.ForeignKey(
@@ -96,9 +196,22 @@ class Review(models.Model):
         auto_now_add=True,
         verbose_name='Дата публикации'
     )
+    updated_at = models.DateTimeField(
+        db_index=True,
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
 
     class Meta:
         ordering = ['-id']
+        indexes = [
+            models.Index(
+                fields=['title', '-id'], name='review_title_id_idx'
+            ),
+            models.Index(
+                fields=['author', '-id'], name='review_author_id_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['author', 'title'],
@@ -106,6 +219,14 @@ class Review(models.Model):
             )
         ]
 
+    def save(self, *args, **kwargs):
+        """
+        Строка отзыва, заблокированная сигналом pre_save, остаётся
+        заблокированной до изменения рейтинга в post_save.
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     review = models.ForeignKey(
@@ -129,6 +250,117 @@ class Comment(models.Model):
         auto_now_add=True,
         verbose_name='Дата публикации',
     )
+    updated_at = models.DateTimeField(
+        db_index=True,
+        auto_now=True,
+        verbose_name='Дата изменения',
+    )
 
     class Meta:
         ordering = ['-id']
+        indexes = [
+            models.Index(
+                fields=['review', '-id'], name='comment_review_id_idx'
+            ),
+            models.Index(
+                fields=['author', '-id'], name='comment_author_id_idx'
+            ),
+        ]
+
+
+class ImportCheckpoint(models.Model):
+    """Позиция, до которой csv_import загрузил файл."""
+    filename = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name='Файл'
+    )
+    offset = models.BigIntegerField(
+        default=0,
+        verbose_name='Смещение в байтах'
+    )
+    rows = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Обработано строк'
+    )
+    completed = models.BooleanField(
+        default=False,
+        verbose_name='Загрузка завершена'
+    )
+
+
+class ChangeLog(models.Model):
+    """
+    Журнал изменений произведений, отзывов и комментариев.
+    id служит курсором ленты /api/v1/changes/, удаления пишутся как tombstone.
+    """
+    SAVE = 'save'
+    DELETE = 'delete'
+
+    ACTIONS = (
+        (SAVE, 'Сохранение'),
+        (DELETE, 'Удаление'),
+    )
+
+    model = models.CharField(
+        max_length=16,
+        verbose_name='Модель'
+    )
+    object_id = models.PositiveIntegerField(
+        verbose_name='ID объекта'
+    )
+    action = models.CharField(
+        max_length=16,
+        choices=ACTIONS,
+        verbose_name='Действие'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата изменения'
+    )
+
+    class Meta:
+        ordering = ['id']
+
+
+class DataVersionQuerySet(models.QuerySet):
+
+    def bump(self, scope):
+        """
+        Меняет версию области на текущее время в наносекундах.
+        Записи создаются только здесь, чтение версий в базу не пишет.
+        """
+        now = time.time_ns()
+        updated = self.filter(scope=scope).update(
+            value=Greatest(F('value') + 1, now)
+        )
+        if not updated:
+            _, created = self.get_or_create(
+                scope=scope, defaults={'value': now}
+            )
+            if not created:
+                self.bump(scope)
+
+
+class DataVersion(models.Model):
+    """
+    Версии областей данных для ключей кэша и валидаторов api.conditional.
+    Меняется в транзакции изменения данных, поэтому одинакова
+    для всех процессов. У области без записи версия BASE.
+    """
+    BASE = 0
+    # Массовая загрузка в обход сигналов: версия каждой области
+    # не меньше версии этой.
+    BULK_LOAD = 'bulk-load'
+
+    scope = models.CharField(
+        max_length=64,
+        primary_key=True,
+        verbose_name='Область'
+    )
+    value = models.BigIntegerField(
+        default=0,
+        verbose_name='Версия'
+    )
+
+    objects = DataVersionQuerySet.as_manager()
@@ -0,0 +1,155 @@
+from django.db.models import Case, ExpressionWrapper, F, FloatField, When
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import (Category, ChangeLog, Comment, Genre, Review, Title,
+                     deleting_title_ids)
+
+
+def log_change(model, object_id, action):
+    ChangeLog.objects.create(
+        model=model._meta.model_name, object_id=object_id, action=action
+    )
+
+
+def _change_rating(title_id, score_delta, count_delta):
+    """Атомарно изменяет сумму оценок и количество отзывов произведения."""
+    new_sum = F('score_sum') + score_delta
+    new_count = F('reviews_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        score_sum=new_sum,
+        reviews_count=new_count,
+        rating=Case(
+            When(reviews_count=-count_delta, then=None),
+            default=ExpressionWrapper(
+                new_sum * 1.0 / new_count, output_field=FloatField()
+            ),
+            output_field=FloatField(),
+        ),
+        updated_at=timezone.now(),
+    )
+    log_change(Title, title_id, ChangeLog.SAVE)
+
+
+def _locked_rating_state(review):
+    """
+    Текущие произведение и оценка отзыва в базе под блокировкой строки
+    до конца транзакции; None, если отзыв уже удалён.
+    """
+    return Review.objects.select_for_update().filter(
+        pk=review.pk
+    ).values_list('title_id', 'score').first()
+
+
+@receiver(pre_save, sender=Review)
+def lock_review_on_save(sender, instance, **kwargs):
+    # Изменение считается от строки в базе, а не от загруженной копии:
+    # параллельные правки одного отзыва не накапливают ошибку.
+    if not instance._state.adding:
+        instance._rating_state = _locked_rating_state(instance)
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    score = int(instance.score)
+    if created:
+        _change_rating(instance.title_id, score, 1)
+        return
+    old_title_id, old_score = instance._rating_state
+    if old_title_id != instance.title_id:
+        _change_rating(old_title_id, -old_score, -1)
+        _change_rating(instance.title_id, score, 1)
+    elif old_score != score:
+        _change_rating(instance.title_id, score - old_score, 0)
+
+
+@receiver(pre_delete, sender=Review)
+def lock_review_on_delete(sender, instance, **kwargs):
+    if instance.title_id in deleting_title_ids():
+        # Произведение удаляется вместе с отзывом.
+        instance._rating_state = None
+    else:
+        instance._rating_state = _locked_rating_state(instance)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    # Повторное удаление уже удалённого отзыва рейтинг не меняет.
+    if instance._rating_state is not None:
+        old_title_id, old_score = instance._rating_state
+        _change_rating(old_title_id, -old_score, -1)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Comment)
+def log_save(sender, instance, **kwargs):
+    log_change(sender, instance.pk, ChangeLog.SAVE)
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comment)
+def log_delete(sender, instance, **kwargs):
+    log_change(sender, instance.pk, ChangeLog.DELETE)
+
+
+def _touch_titles(title_ids):
+    Title.objects.filter(pk__in=title_ids).update(updated_at=timezone.now())
+    ChangeLog.objects.bulk_create(
+        ChangeLog(
+            model=Title._meta.model_name, object_id=title_id,
+            action=ChangeLog.SAVE
+        )
+        for title_id in title_ids
+    )
+
+
+def _genre_title_ids(genre):
+    return list(
+        Title.genre.through.objects.filter(genre=genre)
+        .values_list('title_id', flat=True)
+    )
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def log_genre_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        # В post_clear pk_set пуст, а связи уже удалены.
+        instance._cleared_title_ids = _genre_title_ids(instance)
+    if not action.startswith('post_'):
+        return
+    if action == 'post_clear' and reverse:
+        title_ids = instance.__dict__.pop('_cleared_title_ids', ())
+    elif reverse:
+        # Изменение со стороны жанра: затронуты произведения из pk_set.
+        title_ids = pk_set or ()
+    else:
+        title_ids = (instance.pk,)
+    _touch_titles(title_ids)
+
+
+@receiver(pre_delete, sender=Genre)
+def remember_genre_titles(sender, instance, **kwargs):
+    # Связи жанра удаляются без сигнала m2m_changed.
+    instance._deleted_title_ids = _genre_title_ids(instance)
+
+
+@receiver(post_delete, sender=Genre)
+def log_genre_delete(sender, instance, **kwargs):
+    _touch_titles(instance._deleted_title_ids)
+
+
+@receiver(pre_delete, sender=Category)
+def remember_category_titles(sender, instance, **kwargs):
+    # SET_NULL обнуляет category_id запросом UPDATE без сигналов.
+    instance._deleted_title_ids = list(
+        instance.titles.values_list('pk', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Category)
+def log_category_delete(sender, instance, **kwargs):
+    _touch_titles(instance._deleted_title_ids)
@@ -0,0 +1,121 @@
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from ...models import EmailOutbox
+
+
+class Command(BaseCommand):
+    help = "Sends queued emails from EmailOutbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Количество писем, отправляемых через одно соединение.'
+        )
+        parser.add_argument(
+            '--max-attempts', type=int, default=5,
+            help='После стольких неудачных попыток письмо помечается failed.'
+        )
+        parser.add_argument(
+            '--backoff', type=float, default=30,
+            help='Базовая задержка повтора в секундах, удваивается '
+                 'с каждой попыткой.'
+        )
+        parser.add_argument(
+            '--lease', type=float, default=300,
+            help='На сколько секунд письма пачки закрепляются за этим '
+                 'обработчиком; должно превышать время отправки пачки.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать непрерывно, опрашивая очередь.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза между опросами пустой очереди в режиме --loop.'
+        )
+
+    def _claim(self, batch_size, lease):
+        """
+        Забирает пачку писем одним условным UPDATE: next_attempt_at
+        сдвигается на время аренды, поэтому параллельный обработчик
+        эти письма не получит. Если обработчик упал, после аренды
+        письма снова становятся доступны.
+        """
+        token = uuid.uuid4().hex
+        while True:
+            now = timezone.now()
+            pending = EmailOutbox.objects.filter(
+                status=EmailOutbox.PENDING, next_attempt_at__lte=now,
+            )
+            ids = list(pending.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return []
+            pending.filter(pk__in=ids).update(
+                lease=token, next_attempt_at=now + timedelta(seconds=lease)
+            )
+            claimed = list(
+                EmailOutbox.objects.filter(pk__in=ids, lease=token)
+            )
+            # Пустая пачка — все письма забрал другой обработчик.
+            if claimed:
+                return claimed
+
+    def _failed(self, message, error, options):
+        message.attempts += 1
+        message.last_error = f'{type(error).__name__}: {error}'
+        if message.attempts >= options['max_attempts']:
+            message.status = EmailOutbox.FAILED
+        else:
+            message.next_attempt_at = timezone.now() + timedelta(
+                seconds=options['backoff'] * 2 ** (message.attempts - 1)
+            )
+        message.save(update_fields=(
+            'attempts', 'last_error', 'status', 'next_attempt_at'
+        ))
+
+    def _send_batch(self, messages, options):
+        """Отправляет пачку писем через одно открытое соединение."""
+        sent = 0
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as error:
+            for message in messages:
+                self._failed(message, error, options)
+            return sent
+        try:
+            for message in messages:
+                try:
+                    EmailMessage(
+                        message.subject, message.body, message.from_email,
+                        [message.recipient], connection=connection,
+                    ).send()
+                except Exception as error:
+                    self._failed(message, error, options)
+                    continue
+                message.status = EmailOutbox.SENT
+                message.attempts += 1
+                message.sent_at = timezone.now()
+                message.save(update_fields=('status', 'attempts', 'sent_at'))
+                sent += 1
+        finally:
+            connection.close()
+        return sent
+
+    def handle(self, *args, **options):
+        sent = 0
+        while True:
+            messages = self._claim(options['batch_size'], options['lease'])
+            if messages:
+                sent += self._send_batch(messages, options)
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(f'Sent {sent} emails')
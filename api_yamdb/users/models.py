@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -38,3 +39,64 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.username
+
+
+class EmailOutbox(models.Model):
+    """
+    Письмо, ожидающее отправки командой send_outbox.
+    Создаётся в одной транзакции с изменением пользователя.
+    """
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+    STATUSES = (
+        (PENDING, 'Ожидает отправки'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не отправлено'),
+    )
+
+    recipient = models.EmailField(verbose_name='получатель')
+    subject = models.CharField(verbose_name='тема', max_length=255)
+    body = models.TextField(verbose_name='текст')
+    from_email = models.EmailField(verbose_name='отправитель')
+    status = models.CharField(
+        verbose_name='статус',
+        max_length=16,
+        choices=STATUSES,
+        default=PENDING,
+    )
+    attempts = models.PositiveIntegerField(
+        verbose_name='попыток отправки',
+        default=0,
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='следующая попытка',
+        default=timezone.now,
+    )
+    last_error = models.TextField(verbose_name='последняя ошибка', blank=True)
+    # Метка обработчика send_outbox, забравшего письмо до next_attempt_at.
+    lease = models.CharField(
+        verbose_name='метка обработчика',
+        max_length=32,
+        blank=True,
+    )
+    created_at = models.DateTimeField(
+        verbose_name='создано',
+        auto_now_add=True,
+    )
+    sent_at = models.DateTimeField(
+        verbose_name='отправлено',
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['status', 'next_attempt_at'],
+                name='outbox_pending_idx'
+            ),
+        ]
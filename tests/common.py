@@ -1,8 +1,20 @@
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
 
+def get_with_queries(client, url):
+    """GET запрос со статусом 200: ответ и SQL выполненных запросов."""
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+    )
+    return response, [query['sql'] for query in context.captured_queries]
+
+
 def create_users_api(admin_client):
     data = {
         'username': 'TestUser',
@@ -0,0 +1,138 @@
+import pytest
+
+from tests.common import auth_client, create_reviews
+
+
+class Test08TitleRating:
+
+    def get_title(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == 200
+        return response.json()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_follows_reviews(self, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        assert self.get_title(admin_client, title_id)['rating'] == 4, (
+            'Проверьте, что `rating` пересчитывается при создании отзыва'
+        )
+
+        response = admin_client.patch(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/',
+            data={'score': 8}
+        )
+        assert response.status_code == 200
+        assert self.get_title(admin_client, title_id)['rating'] == 5, (
+            'Проверьте, что `rating` пересчитывается при изменении оценки'
+        )
+
+        response = auth_client(user).delete(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[1]["id"]}/'
+        )
+        assert response.status_code == 204
+        assert self.get_title(admin_client, title_id)['rating'] == 6, (
+            'Проверьте, что `rating` пересчитывается при удалении отзыва'
+        )
+
+        moderator.delete()
+        assert self.get_title(admin_client, title_id)['rating'] == 8, (
+            'Проверьте, что `rating` пересчитывается при каскадном '
+            'удалении отзывов вместе с пользователем'
+        )
+
+        response = admin_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/'
+        )
+        assert response.status_code == 204
+        assert self.get_title(admin_client, title_id)['rating'] is None, (
+            'Проверьте, что `rating` без отзывов равен `None`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_update_keeps_rating(self, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        stale_title = Title.objects.get(pk=title_id)
+        admin_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/'
+            f'{Title.objects.get(pk=title_id).reviews.first().id}/'
+        )
+        stale_title.name = 'Новое название'
+        stale_title.save()
+        title = Title.objects.get(pk=title_id)
+        assert title.name == 'Новое название'
+        assert title.reviews_count == 2, (
+            'Проверьте, что сохранение произведения не затирает '
+            'счётчики рейтинга устаревшими значениями'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_recalculate_rating(self, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        Title.objects.update(rating=None, score_sum=0, reviews_count=0)
+        Title.objects.recalculate_rating()
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating, title.score_sum, title.reviews_count) == (
+            4, 12, 3
+        ), 'Проверьте, что `recalculate_rating` восстанавливает рейтинг'
+        empty_title = Title.objects.get(pk=titles[1]['id'])
+        assert (empty_title.rating, empty_title.reviews_count) == (None, 0)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_stale_instances(self, admin_client, admin):
+        from reviews.models import Review, Title
+
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        first = Review.objects.get(pk=reviews[0]['id'])
+        second = Review.objects.get(pk=reviews[0]['id'])
+        first.score = 10
+        first.save()
+        second.score = 6
+        second.save()
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.reviews_count) == (13, 3), (
+            'Проверьте, что изменение оценки считается от значения в базе, '
+            'а не от загруженной ранее копии отзыва'
+        )
+
+        first.delete()
+        second.delete()
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.reviews_count) == (7, 2), (
+            'Проверьте, что повторное удаление уже удалённого отзыва '
+            'не меняет рейтинг'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_title_delete_skips_rating(self, admin_client, admin):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from reviews.models import ChangeLog
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        last_change = ChangeLog.objects.latest('id').pk
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.delete(
+                f'/api/v1/titles/{titles[0]["id"]}/'
+            )
+        assert response.status_code == 204
+        updates = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('UPDATE "reviews_title"')
+        ]
+        assert not updates, (
+            'Проверьте, что при удалении произведения рейтинг не '
+            f'пересчитывается для каждого отзыва: {updates}'
+        )
+        assert not ChangeLog.objects.filter(
+            pk__gt=last_change, model='title', action=ChangeLog.SAVE
+        ).exists(), (
+            'Проверьте, что удаление произведения не пишет в журнал '
+            'изменение рейтинга для каждого отзыва'
+        )
@@ -0,0 +1,164 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.common import create_titles, get_with_queries
+
+
+class Test09QueryCount:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_list_constant_queries(self, client, admin_client):
+        from reviews.models import Category, Genre, Title
+
+        create_titles(admin_client)
+        _, small_page = get_with_queries(client, '/api/v1/titles/?limit=2')
+
+        category = Category.objects.first()
+        genres = list(Genre.objects.all())
+        for number in range(30):
+            title = Title.objects.create(
+                name=f'Произведение {number}', year=2000, category=category
+            )
+            title.genre.set(genres)
+        _, large_page = get_with_queries(client, '/api/v1/titles/?limit=30')
+
+        assert len(large_page) == len(small_page) <= 4, (
+            'Проверьте, что количество SQL-запросов при GET запросе '
+            '`/api/v1/titles/` не зависит от размера страницы'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_detail_queries(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        _, queries = get_with_queries(
+            client, f'/api/v1/titles/{titles[0]["id"]}/'
+        )
+        assert len(queries) <= 3, (
+            'Проверьте, что GET запрос `/api/v1/titles/{title_id}/` '
+            'загружает категорию и жанры без лишних SQL-запросов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_review_and_comment_list_queries(self, client, admin_client,
+                                                django_user_model):
+        from reviews.models import Comment, Review
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        django_user_model.objects.bulk_create(
+            django_user_model(
+                username=f'reviewer{number}',
+                email=f'reviewer{number}@yamdb.fake'
+            )
+            for number in range(100)
+        )
+        authors = django_user_model.objects.filter(
+            username__startswith='reviewer'
+        )
+        for author in authors:
+            review = Review.objects.create(
+                title_id=title_id, author=author, text='Текст', score=5
+            )
+
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        _, first_page = get_with_queries(client, reviews_url)
+        _, last_page = get_with_queries(client, f'{reviews_url}?page=10')
+        assert len(first_page) == len(last_page) <= 4, (
+            'Проверьте, что GET запрос `/api/v1/titles/{title_id}/reviews/` '
+            'загружает авторов и произведение без запроса на каждый отзыв'
+        )
+
+        Comment.objects.bulk_create(
+            Comment(review=review, author=author, text='Ещё')
+            for author in authors
+        )
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        _, first_page = get_with_queries(client, comments_url)
+        _, last_page = get_with_queries(client, f'{comments_url}?page=10')
+        assert len(first_page) == len(last_page) <= 4, (
+            'Проверьте, что GET запрос '
+            '`/api/v1/titles/{title_id}/reviews/{review_id}/comments/` '
+            'загружает авторов без запроса на каждый комментарий'
+        )
+
+    def count_write_queries(self, client, url, data):
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(url, data=data)
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if not query['sql'].startswith(('SAVEPOINT', 'RELEASE', 'BEGIN'))
+        ]
+        versions = [sql for sql in queries if 'reviews_dataversion' in sql]
+        return response, [sql for sql in queries if sql not in versions], (
+            versions
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_signup_queries(self, client):
+        data = {'username': 'signup', 'email': 'signup@yamdb.fake'}
+        response, queries, versions = self.count_write_queries(
+            client, '/api/v1/auth/signup/', data
+        )
+        assert response.status_code == 200
+        assert versions, (
+            'Проверьте, что новый пользователь меняет версию списка '
+            'пользователей'
+        )
+        assert len(queries) == 3, (
+            'Проверьте, что регистрация выполняет один SELECT, одну запись '
+            f'пользователя и одну запись письма в очередь: {queries}'
+        )
+        assert sum(sql.startswith('INSERT INTO "users_user"')
+                   for sql in queries) == 1
+
+        response, queries, versions = self.count_write_queries(
+            client, '/api/v1/auth/signup/', data
+        )
+        assert response.status_code == 200, (
+            'Проверьте, что повторная регистрация той же пары '
+            'username/email возвращает статус 200'
+        )
+        assert len(queries) == 3
+        assert not versions, (
+            'Проверьте, что новый confirmation_code не меняет версию '
+            'списка пользователей'
+        )
+        assert sum(sql.startswith('UPDATE "users_user"')
+                   for sql in queries) == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_token_queries(self, client, django_user_model):
+        django_user_model.objects.create(
+            username='token', email='token@yamdb.fake',
+            confirmation_code='code'
+        )
+        response, queries, _ = self.count_write_queries(
+            client, '/api/v1/auth/token/',
+            {'username': 'token', 'confirmation_code': 'code'}
+        )
+        assert response.status_code == 200
+        assert len(queries) == 1, (
+            'Проверьте, что получение токена выполняет один запрос'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_signup_codes_are_unique(self, client, django_user_model):
+        for username in ('victim', 'attacker'):
+            response = client.post('/api/v1/auth/signup/', data={
+                'username': username, 'email': f'{username}@yamdb.fake'
+            })
+            assert response.status_code == 200
+        codes = dict(django_user_model.objects.filter(
+            username__in=('victim', 'attacker')
+        ).values_list('username', 'confirmation_code'))
+        assert codes['victim'] != codes['attacker'], (
+            'Проверьте, что новые пользователи получают разные '
+            'confirmation_code'
+        )
+        response = client.post('/api/v1/auth/token/', data={
+            'username': 'victim', 'confirmation_code': codes['attacker']
+        })
+        assert response.status_code == 400, (
+            'Проверьте, что чужой confirmation_code не выдаёт токен'
+        )
@@ -0,0 +1,63 @@
+import pytest
+
+from tests.common import create_reviews, create_titles, get_with_queries
+
+
+class Test10CursorPagination:
+
+    def collect(self, client, url):
+        results = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200, (
+                f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+            )
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что курсорная пагинация не считает `count`'
+            )
+            results.extend(data['results'])
+            url = data['next']
+        return results
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_cursor(self, client, admin_client):
+        from reviews.models import Title
+
+        create_titles(admin_client)
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {number}', year=2000)
+            for number in range(7)
+        )
+        results = self.collect(
+            client, '/api/v1/titles/?pagination=cursor&limit=2'
+        )
+        ids = [title['id'] for title in results]
+        assert ids == sorted(Title.objects.values_list('id', flat=True)), (
+            'Проверьте, что курсорная пагинация `/api/v1/titles/` '
+            'возвращает все произведения по возрастанию id без повторов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_review_cursor(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        results = self.collect(client, f'{url}?pagination=cursor&limit=1')
+        assert [review['id'] for review in results] == sorted(
+            (review['id'] for review in reviews), reverse=True
+        ), (
+            'Проверьте, что курсорная пагинация отзывов '
+            'сохраняет порядок по убыванию id'
+        )
+        _, queries = get_with_queries(client, f'{url}?pagination=cursor')
+        assert not any('COUNT(' in sql for sql in queries), (
+            'Проверьте, что курсорная пагинация не выполняет COUNT(*)'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_default_pagination_unchanged(self, client, admin_client):
+        create_titles(admin_client)
+        data = client.get('/api/v1/titles/').json()
+        assert data['count'] == 2, (
+            'Проверьте, что без `?pagination=cursor` пагинация не меняется'
+        )
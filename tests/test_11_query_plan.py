@@ -0,0 +1,68 @@
+import re
+
+import pytest
+from django.db import connection
+
+from tests.common import create_comments, get_with_queries
+
+FULL_SCAN = re.compile(
+    r'SCAN (TABLE )?reviews_(review|comment)\b(?! USING)'
+)
+TEMP_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+
+
+def query_plans(client, url):
+    _, queries = get_with_queries(client, url)
+    with connection.cursor() as cursor:
+        for sql in queries:
+            if 'reviews_review' not in sql and 'reviews_comment' not in sql:
+                continue
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = ' | '.join(str(row[-1]) for row in cursor.fetchall())
+            yield sql, plan
+
+
+class Test11QueryPlan:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_indexes_exist(self):
+        with connection.cursor() as cursor:
+            review_indexes = connection.introspection.get_constraints(
+                cursor, 'reviews_review'
+            )
+            comment_indexes = connection.introspection.get_constraints(
+                cursor, 'reviews_comment'
+            )
+        assert review_indexes['review_title_id_idx']['columns'] == [
+            'title_id', 'id'
+        ]
+        assert review_indexes['review_author_id_idx']['columns'] == [
+            'author_id', 'id'
+        ]
+        assert comment_indexes['comment_review_id_idx']['columns'] == [
+            'review_id', 'id'
+        ]
+        assert comment_indexes['comment_author_id_idx']['columns'] == [
+            'author_id', 'id'
+        ]
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('pagination', ['', '?pagination=cursor'])
+    def test_02_list_endpoints_use_indexes(self, client, admin_client, admin,
+                                           pagination):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        urls = (
+            f'{reviews_url}{pagination}',
+            f'{reviews_url}{reviews[0]["id"]}/comments/{pagination}',
+        )
+        for url in urls:
+            for sql, plan in query_plans(client, url):
+                assert not FULL_SCAN.search(plan), (
+                    f'Проверьте, что GET запрос `{url}` не сканирует всю '
+                    f'таблицу.\nЗапрос: {sql}\nПлан: {plan}'
+                )
+                assert TEMP_SORT not in plan, (
+                    f'Проверьте, что GET запрос `{url}` сортирует по '
+                    f'индексу.\nЗапрос: {sql}\nПлан: {plan}'
+                )
@@ -0,0 +1,60 @@
+import pytest
+
+from tests.common import (auth_client, create_titles, create_users_api,
+                          get_with_queries)
+
+
+class Test12CatalogCache:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('url', [
+        '/api/v1/titles/', '/api/v1/categories/', '/api/v1/genres/'
+    ])
+    def test_01_repeated_read_is_cached(self, client, admin_client, url):
+        create_titles(admin_client)
+        first, _ = get_with_queries(client, url)
+        second, queries = get_with_queries(client, url)
+        assert first.json() == second.json()
+        assert len(queries) == 1, (
+            f'Проверьте, что повторный GET запрос `{url}` '
+            'отдаётся из кэша после одного запроса версии'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_query_string_in_key(self, client, admin_client):
+        create_titles(admin_client)
+        get_with_queries(client, '/api/v1/titles/')
+        data = get_with_queries(client, '/api/v1/titles/?year=2020')[0].json()
+        assert [title['year'] for title in data['results']] == [2020], (
+            'Проверьте, что фильтры входят в ключ кэша'
+        )
+        data = get_with_queries(client, '/api/v1/genres/?search=Драма')[0].json()
+        assert len(data['results']) == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_invalidation(self, client, admin_client, admin):
+        titles, _, _ = create_titles(admin_client)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        get_with_queries(client, title_url)
+        get_with_queries(client, '/api/v1/genres/')
+
+        user, _ = create_users_api(admin_client)
+        auth_client(user).post(
+            f'{title_url}reviews/', data={'text': 'Текст', 'score': 8}
+        )
+        data = get_with_queries(client, title_url)[0].json()
+        assert data['rating'] == 8, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведения'
+        )
+
+        admin_client.patch(title_url, data={'genre': ['drama']})
+        data = get_with_queries(client, title_url)[0].json()
+        assert [genre['slug'] for genre in data['genre']] == ['drama'], (
+            'Проверьте, что изменение жанров сбрасывает кэш произведения'
+        )
+
+        admin_client.delete('/api/v1/genres/horror/')
+        data = get_with_queries(client, '/api/v1/genres/')[0].json()
+        assert 'horror' not in [genre['slug'] for genre in data['results']], (
+            'Проверьте, что удаление жанра сбрасывает кэш списка жанров'
+        )
@@ -0,0 +1,176 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.common import auth_client, create_comments, create_titles
+
+OTHER_PROCESS_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'other-process',
+    }
+}
+
+
+class Test13ConditionalGet:
+
+    def assert_not_modified(self, client, url, **headers):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, **headers)
+        assert response.status_code == 304, (
+            f'Проверьте, что GET запрос `{url}` с актуальным валидатором '
+            'возвращает статус 304'
+        )
+        assert not response.content
+        queries = [query['sql'] for query in context.captured_queries]
+        assert len(queries) == 1 and 'reviews_dataversion' in queries[0], (
+            f'Проверьте, что GET запрос `{url}` проверяет валидаторы '
+            'одним запросом версий'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_etag(self, client, admin_client, admin):
+        comments, reviews, titles, user, _ = create_comments(
+            admin_client, admin
+        )
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        reviews_url = f'{title_url}reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        etags = {}
+        for url in (title_url, reviews_url, comments_url):
+            response = client.get(url)
+            assert response.status_code == 200
+            assert response['ETag'].startswith('"'), (
+                f'Проверьте, что GET запрос `{url}` возвращает строгий ETag'
+            )
+            etags[url] = response['ETag']
+            self.assert_not_modified(
+                client, url, HTTP_IF_NONE_MATCH=etags[url]
+            )
+
+        auth_client(user).post(comments_url, data={'text': 'Новый'})
+        response = client.get(
+            comments_url, HTTP_IF_NONE_MATCH=etags[comments_url]
+        )
+        assert response.status_code == 200, (
+            'Проверьте, что новый комментарий меняет ETag списка комментариев'
+        )
+        self.assert_not_modified(
+            client, reviews_url, HTTP_IF_NONE_MATCH=etags[reviews_url]
+        )
+
+        admin_client.patch(
+            f'{reviews_url}{reviews[0]["id"]}/', data={'score': 10}
+        )
+        for url in (title_url, reviews_url):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == 200, (
+                f'Проверьте, что изменение отзыва меняет ETag `{url}`'
+            )
+
+        etag = client.get(comments_url)['ETag']
+        admin.username = 'RenamedAdmin'
+        admin.save()
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert 'RenamedAdmin' in [
+            comment['author'] for comment in response.json()['results']
+        ], 'Проверьте, что смена username меняет ETag комментариев'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_last_modified(self, client, admin_client, admin):
+        _, _, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url)
+        self.assert_not_modified(
+            client, url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_versions_shared_between_processes(self, client,
+                                                  admin_client):
+        from django.core.cache import cache
+        from django.db import transaction
+        from django.test import override_settings
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = client.get(url)['ETag']
+        # Другой процесс: свой локальный кэш без версий.
+        cache.clear()
+        self.assert_not_modified(client, url, HTTP_IF_NONE_MATCH=etag)
+
+        title = Title.objects.get(pk=titles[0]['id'])
+        try:
+            with transaction.atomic():
+                title.name = 'Откат'
+                title.save()
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assert_not_modified(client, url, HTTP_IF_NONE_MATCH=etag)
+
+        with override_settings(CACHES=OTHER_PROCESS_CACHES):
+            title.name = 'Новое название'
+            title.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что изменение данных меняет ETag во всех процессах, '
+            'а не только в локальном кэше изменившего их процесса'
+        )
+        assert response.json()['name'] == 'Новое название'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_reads_do_not_write_versions(self, client, admin_client,
+                                            admin):
+        from reviews.models import DataVersion
+
+        comments, reviews, titles, user, _ = create_comments(
+            admin_client, admin
+        )
+        rows = DataVersion.objects.count()
+        for number in range(5):
+            assert client.get(
+                f'/api/v1/titles/{10 ** 6 + number}/reviews/'
+            ).status_code == 404
+            assert client.get(
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+                f'{10 ** 6 + number}/comments/'
+            ).status_code == 404
+        assert DataVersion.objects.count() == rows, (
+            'Проверьте, что чтение не создаёт записи версий'
+        )
+
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etags = {
+            url: client.get(url)['ETag']
+            for url in (title_url, '/api/v1/genres/', '/api/v1/categories/')
+        }
+        auth_client(user).patch(
+            f'{title_url}reviews/{reviews[1]["id"]}/', data={'score': 1}
+        )
+        assert client.get(
+            title_url, HTTP_IF_NONE_MATCH=etags[title_url]
+        ).status_code == 200
+        for url in ('/api/v1/genres/', '/api/v1/categories/'):
+            self.assert_not_modified(
+                client, url, HTTP_IF_NONE_MATCH=etags[url]
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_bulk_load_changes_all_versions(self, client, admin_client,
+                                               admin):
+        from reviews.models import DataVersion
+
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        DataVersion.objects.filter(scope__startswith='comments:').delete()
+        etag = client.get(url)['ETag']
+        DataVersion.objects.bump(DataVersion.BULK_LOAD)
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            'Проверьте, что массовая загрузка меняет версии всех областей'
+        )
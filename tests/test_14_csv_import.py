@@ -0,0 +1,158 @@
+import pytest
+from django.core.management import call_command
+
+
+class Test14CsvImport:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_import_bundled_data(self, django_user_model):
+        from reviews.models import Comment, Review, Title
+
+        call_command('csv_import', batch_size=10)
+        assert django_user_model.objects.count() == 5
+        assert Title.objects.count() == 32
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        assert Title.genre.through.objects.count() == 42
+        assert not django_user_model.objects.filter(
+            first_name__startswith='['
+        ).exists(), 'Проверьте, что first_name загружается из csv'
+        title = Title.objects.get(pk=1)
+        assert title.reviews_count == title.reviews.count(), (
+            'Проверьте, что после импорта пересчитывается рейтинг'
+        )
+        assert title.rating == sum(
+            title.reviews.values_list('score', flat=True)
+        ) / title.reviews_count
+
+    def copy_data(self, tmp_path):
+        import shutil
+        from django.conf import settings
+
+        data_dir = tmp_path / 'data'
+        shutil.copytree(
+            f'{settings.BASE_DIR}/static/data', data_dir
+        )
+        return data_dir
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_already_loaded(self, capsys, user):
+        from reviews.models import Category
+
+        call_command('csv_import')
+        assert 'already loaded' in capsys.readouterr().out
+        assert not Category.objects.exists(), (
+            'Проверьте, что без --upsert и --resume импорт в непустую '
+            'базу не выполняется'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_upsert_and_rejects(self, tmp_path):
+        from reviews.models import Category, Review
+
+        data_dir = self.copy_data(tmp_path)
+        reject_file = tmp_path / 'rejects.csv'
+        call_command('csv_import', data_dir=str(data_dir))
+        Category.objects.filter(pk=1).update(name='Старое имя')
+        with open(data_dir / 'review.csv', 'a', encoding='utf-8') as f:
+            f.write('\n1000,1,Новый отзыв,102,5,2020-01-01T00:00:00Z\n')
+            f.write('1003,1,Второй отзыв автора,100,5,2020-01-01T00:00:00Z\n')
+            f.write('1001,1,Оценка вне диапазона,101,11,'
+                    '2020-01-01T00:00:00Z\n')
+            f.write('1002,999,Нет произведения,101,5,2020-01-01T00:00:00Z\n')
+
+        call_command(
+            'csv_import', upsert=True, data_dir=str(data_dir),
+            reject_file=str(reject_file)
+        )
+        assert Category.objects.get(pk=1).name == 'Фильм', (
+            'Проверьте, что --upsert обновляет существующие строки'
+        )
+        assert Review.objects.filter(pk=1000).exists()
+        assert Review.objects.count() == 73
+        rejects = reject_file.read_text(encoding='utf-8')
+        assert all(
+            f'"{pk}"' in rejects for pk in (1001, 1002, 1003)
+        ), (
+            'Проверьте, что строки с ошибками попадают в файл отказов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_resume(self, tmp_path, monkeypatch):
+        from reviews.management.commands.csv_import import Command
+        from reviews.models import ImportCheckpoint, Review
+
+        build = Command._build
+        calls = []
+
+        def crash_on_third_review_batch(self, model, rows):
+            if model is Review:
+                calls.append(rows)
+                if len(calls) == 3:
+                    raise RuntimeError('Import crashed')
+            return build(self, model, rows)
+
+        monkeypatch.setattr(Command, '_build', crash_on_third_review_batch)
+        with pytest.raises(RuntimeError):
+            call_command('csv_import', batch_size=10)
+        assert Review.objects.count() == 20
+        checkpoint = ImportCheckpoint.objects.get(filename='review.csv')
+        assert (checkpoint.rows, checkpoint.completed) == (20, False)
+
+        monkeypatch.setattr(Command, '_build', build)
+        call_command('csv_import', batch_size=10, resume=True)
+        assert Review.objects.count() == 72, (
+            'Проверьте, что --resume продолжает импорт с места остановки'
+        )
+        assert ImportCheckpoint.objects.filter(completed=False).count() == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_parallel_workers(self, tmp_path):
+        import csv
+        from django.conf import settings
+        from reviews.models import Review
+
+        reject_file = tmp_path / 'rejects.csv'
+        call_command(
+            'csv_import', workers=2, batch_size=7,
+            reject_file=str(reject_file)
+        )
+        with open(f'{settings.BASE_DIR}/static/data/review.csv',
+                  encoding='utf-8', newline='') as csvfile:
+            expected = {
+                int(row['id']): row['text'] for row in csv.DictReader(csvfile)
+            }
+        assert dict(Review.objects.values_list('id', 'text')) == expected, (
+            'Проверьте, что --workers разбирает файлы так же, как '
+            'последовательный импорт, включая многострочные поля'
+        )
+        assert not reject_file.exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_upsert_writes_changes(self, tmp_path):
+        from reviews.models import ChangeLog, Comment, Review, Title
+
+        data_dir = self.copy_data(tmp_path)
+        call_command('csv_import', data_dir=str(data_dir))
+        assert ChangeLog.objects.filter(model='review').count() == 72, (
+            'Проверьте, что импорт пишет загруженные отзывы в журнал '
+            'изменений'
+        )
+        last_change = ChangeLog.objects.latest('id').pk
+        Title.objects.filter(pk=1).update(score_sum=0)
+        with open(data_dir / 'review.csv', 'a', encoding='utf-8') as f:
+            f.write('\n1000,1,Новый отзыв,102,5,2020-01-01T00:00:00Z\n')
+
+        call_command('csv_import', upsert=True, data_dir=str(data_dir))
+        changes = ChangeLog.objects.filter(pk__gt=last_change)
+        assert changes.filter(model='review').count() == 73
+        assert changes.filter(model='comment').count() == (
+            Comment.objects.count()
+        )
+        assert changes.filter(model='title', object_id=1).exists(), (
+            'Проверьте, что импорт пишет в журнал произведения, '
+            'рейтинг которых пересчитан'
+        )
+        assert Title.objects.get(pk=1).score_sum == sum(
+            Review.objects.filter(title_id=1).values_list('score', flat=True)
+        )
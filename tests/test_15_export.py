@@ -0,0 +1,59 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+
+def dump_all():
+    from reviews.export import DATASETS, export_rows
+
+    return {dataset: list(export_rows(dataset)) for dataset in DATASETS}
+
+
+class Test15Export:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_endpoint_permissions(self, client, user_client, admin_client):
+        url = '/api/v1/export/titles.csv'
+        assert client.get(url).status_code == 401, (
+            f'Проверьте, что GET запрос `{url}` без токена возвращает 401'
+        )
+        assert user_client.get(url).status_code == 403, (
+            f'Проверьте, что GET запрос `{url}` доступен только администратору'
+        )
+        assert admin_client.get(url).status_code == 200
+        assert admin_client.get('/api/v1/export/unknown.csv').status_code == 404
+        assert admin_client.get('/api/v1/export/titles.xml').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_endpoint_streams(self, admin_client):
+        call_command('csv_import', upsert=True)
+        response = admin_client.get('/api/v1/export/review.ndjson')
+        assert response.status_code == 200
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся через StreamingHttpResponse'
+        )
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert len(lines) == 72
+        assert set(json.loads(lines[0])) == {
+            'id', 'title_id', 'text', 'author', 'score', 'pub_date'
+        }
+
+        response = admin_client.get('/api/v1/export/category.csv')
+        content = b''.join(response.streaming_content).decode()
+        assert content.splitlines()[:2] == ['id,name,slug', '1,Фильм,movie']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_round_trip(self, tmp_path):
+        call_command('csv_import')
+        before = dump_all()
+        call_command('csv_export', str(tmp_path))
+        call_command('flush', interactive=False)
+        call_command(
+            'csv_import', data_dir=str(tmp_path),
+            reject_file=str(tmp_path / 'rejects.csv')
+        )
+        assert dump_all() == before, (
+            'Проверьте, что выгрузка csv_export загружается csv_import '
+            'без потерь'
+        )
@@ -0,0 +1,146 @@
+import pytest
+
+from tests.common import create_reviews
+
+
+def read_feed(client, since=0, limit=100):
+    response = client.get(f'/api/v1/changes/?since={since}&limit={limit}')
+    assert response.status_code == 200, (
+        'Проверьте, что GET запрос `/api/v1/changes/` возвращает статус 200'
+    )
+    return response.json()
+
+
+class Test16Changes:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_feed_with_tombstones(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        since = read_feed(client)['since']
+
+        title_id = titles[0]['id']
+        admin_client.patch(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/',
+            data={'text': 'Исправлено'}
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        changes = read_feed(client, since)['results']
+        assert [
+            (change['model'], change['object_id'], change['action'])
+            for change in changes
+        ] == [
+            ('review', reviews[0]['id'], 'save'),
+            ('title', titles[1]['id'], 'delete'),
+        ], (
+            'Проверьте, что `/api/v1/changes/` отдаёт изменения по порядку, '
+            'включая удаления'
+        )
+        assert [change['id'] for change in changes] == sorted(
+            change['id'] for change in changes
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_feed_paging(self, client, admin_client, admin):
+        create_reviews(admin_client, admin)
+        total = len(read_feed(client)['results'])
+        collected = []
+        data = read_feed(client, limit=2)
+        while True:
+            collected.extend(data['results'])
+            if not data['next']:
+                break
+            data = client.get(data['next']).json()
+        assert len(collected) == total, (
+            'Проверьте, что по ссылкам `next` можно пройти всю ленту'
+        )
+        assert read_feed(client, data['since'])['results'] == []
+        assert client.get('/api/v1/changes/?since=abc').status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_updated_since(self, client, admin_client, admin):
+        from django.utils import timezone
+        from reviews.models import Review, Title
+
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        mark = timezone.now()
+        Title.objects.filter(pk=titles[1]['id']).get().save()
+        Review.objects.get(pk=reviews[1]['id']).save()
+
+        params = {'updated_since': mark.isoformat()}
+        data = client.get('/api/v1/titles/', params).json()
+        assert [title['id'] for title in data['results']] == [
+            titles[1]['id']
+        ], 'Проверьте фильтр `updated_since` для произведений'
+        data = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/', params
+        ).json()
+        assert [review['id'] for review in data['results']] == [
+            reviews[1]['id']
+        ], 'Проверьте фильтр `updated_since` для отзывов'
+        assert set(data['results'][0]) == {
+            'id', 'author', 'title', 'text', 'score', 'pub_date'
+        }, 'Проверьте, что `updated_at` не выводится в ответе об отзыве'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_genre_side_changes(self, client, admin_client, admin):
+        from reviews.models import Genre, Title
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        genre = Genre.objects.filter(titles__isnull=False).first()
+        title_ids = sorted(genre.titles.values_list('pk', flat=True))
+        since = read_feed(client)['since']
+        updated = dict(Title.objects.values_list('pk', 'updated_at'))
+
+        genre.titles.clear()
+        changes = read_feed(client, since)
+        assert sorted(
+            change['object_id'] for change in changes['results']
+            if change['model'] == 'title'
+        ) == title_ids, (
+            'Проверьте, что очистка произведений жанра пишет в журнал '
+            'изменение каждого произведения'
+        )
+        assert all(
+            Title.objects.get(pk=pk).updated_at > updated[pk]
+            for pk in title_ids
+        ), 'Проверьте, что очистка жанра меняет `updated_at` произведений'
+
+        other = Genre.objects.filter(titles__isnull=False).first()
+        title_ids = sorted(other.titles.values_list('pk', flat=True))
+        since = changes['since']
+        other.delete()
+        assert sorted(
+            change['object_id'] for change in read_feed(client, since)[
+                'results'
+            ] if change['model'] == 'title'
+        ) == title_ids, (
+            'Проверьте, что удаление жанра пишет в журнал изменение '
+            'его произведений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_category_delete(self, client, admin_client, admin):
+        from reviews.models import Category, Title
+
+        create_reviews(admin_client, admin)
+        category = Category.objects.filter(titles__isnull=False).first()
+        title_ids = sorted(category.titles.values_list('pk', flat=True))
+        updated = dict(Title.objects.values_list('pk', 'updated_at'))
+        since = read_feed(client)['since']
+
+        response = admin_client.delete(
+            f'/api/v1/categories/{category.slug}/'
+        )
+        assert response.status_code == 204
+        assert sorted(
+            change['object_id'] for change in read_feed(client, since)[
+                'results'
+            ] if change['model'] == 'title'
+        ) == title_ids, (
+            'Проверьте, что удаление категории пишет в журнал изменение '
+            'её произведений'
+        )
+        assert all(
+            Title.objects.get(pk=pk).updated_at > updated[pk]
+            for pk in title_ids
+        ), 'Проверьте, что удаление категории меняет `updated_at` произведений'
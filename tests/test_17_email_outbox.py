@@ -0,0 +1,122 @@
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+
+class Test17EmailOutbox:
+    url_signup = '/api/v1/auth/signup/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_queues_email(self, client):
+        from users.models import EmailOutbox
+
+        data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+        response = client.post(self.url_signup, data=data)
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что запрос на регистрацию не отправляет письмо сам'
+        )
+        message = EmailOutbox.objects.get()
+        assert message.recipient == data['email']
+        assert message.status == EmailOutbox.PENDING
+
+        call_command('send_outbox')
+        assert [sent.to for sent in mail.outbox] == [[data['email']]]
+        message.refresh_from_db()
+        assert message.status == EmailOutbox.SENT
+        assert message.sent_at is not None
+
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что отправленное письмо не отправляется повторно'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_batches_share_connection(self, monkeypatch):
+        from django.core.mail.backends.locmem import EmailBackend
+        from users.models import EmailOutbox
+
+        EmailOutbox.objects.bulk_create(
+            EmailOutbox(
+                recipient=f'user{number}@yamdb.fake', subject='s', body='b',
+                from_email='admin@yamdb.fake'
+            )
+            for number in range(5)
+        )
+        opened = []
+        original_open = EmailBackend.open
+
+        def counting_open(self):
+            opened.append(self)
+            return original_open(self)
+
+        monkeypatch.setattr(EmailBackend, 'open', counting_open, raising=False)
+        call_command('send_outbox', batch_size=2)
+        assert len(mail.outbox) == 5
+        assert len(opened) == 3, (
+            'Проверьте, что пачка писем отправляется через одно соединение'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_retry_with_backoff(self, monkeypatch):
+        from django.core.mail.backends.locmem import EmailBackend
+        from users.models import EmailOutbox
+
+        message = EmailOutbox.objects.create(
+            recipient='retry@yamdb.fake', subject='s', body='b',
+            from_email='admin@yamdb.fake'
+        )
+
+        def broken_send(self, messages):
+            raise ConnectionError('SMTP is down')
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', broken_send)
+        call_command('send_outbox', max_attempts=2)
+        message.refresh_from_db()
+        assert (message.status, message.attempts) == (EmailOutbox.PENDING, 1)
+        assert 'SMTP is down' in message.last_error
+        assert message.next_attempt_at > message.created_at, (
+            'Проверьте, что повторная попытка откладывается'
+        )
+
+        call_command('send_outbox', max_attempts=2, backoff=0)
+        message.refresh_from_db()
+        assert message.status == EmailOutbox.PENDING
+        EmailOutbox.objects.update(next_attempt_at=message.created_at)
+        call_command('send_outbox', max_attempts=2, backoff=0)
+        message.refresh_from_db()
+        assert (message.status, message.attempts) == (EmailOutbox.FAILED, 2)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_workers_do_not_share_messages(self):
+        from django.utils import timezone
+        from users.management.commands.send_outbox import Command
+        from users.models import EmailOutbox
+
+        EmailOutbox.objects.bulk_create(
+            EmailOutbox(
+                recipient=f'user{number}@yamdb.fake', subject='s', body='b',
+                from_email='admin@yamdb.fake'
+            )
+            for number in range(4)
+        )
+        claimed = Command()._claim(batch_size=2, lease=300)
+        assert len(claimed) == 2
+        call_command('send_outbox')
+        assert sorted(message.to[0] for message in mail.outbox) == sorted(
+            message.recipient for message in EmailOutbox.objects.exclude(
+                pk__in=[message.pk for message in claimed]
+            )
+        ), (
+            'Проверьте, что второй обработчик send_outbox не отправляет '
+            'письма, забранные первым'
+        )
+
+        EmailOutbox.objects.filter(
+            pk__in=[message.pk for message in claimed]
+        ).update(next_attempt_at=timezone.now())
+        call_command('send_outbox')
+        assert len(mail.outbox) == 4, (
+            'Проверьте, что после истечения аренды письма упавшего '
+            'обработчика отправляются'
+        )
@@ -0,0 +1,53 @@
+import pytest
+
+from tests.common import auth_client, create_reviews, get_with_queries
+
+
+class Test18AuthCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_no_user_query_in_steady_state(self, user_client):
+        url = '/api/v1/users/me/'
+        assert user_client.get(url).status_code == 200
+        _, queries = get_with_queries(user_client, url)
+        assert not [sql for sql in queries if 'users_user' in sql], (
+            'Проверьте, что аутентифицированный пользователь берётся из кэша'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_role_change_invalidates(self, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        client = auth_client(user)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        assert client.delete(url).status_code == 403
+
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'}
+        )
+        assert response.status_code == 200
+        assert client.delete(url).status_code == 204, (
+            'Проверьте, что смена роли сразу сбрасывает кэш пользователя'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_deleted_user_rejected(self, admin_client, user, user_client):
+        assert user_client.get('/api/v1/users/me/').status_code == 200
+        user.delete()
+        assert user_client.get('/api/v1/users/me/').status_code == 401
+
+    def test_04_lru_bounds(self, monkeypatch):
+        from api.authentication import LRUCache
+
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set(1, 'a')
+        cache.set(2, 'b')
+        cache.get(1)
+        cache.set(3, 'c')
+        assert (cache.get(1), cache.get(2), cache.get(3)) == ('a', None, 'c')
+
+        now = [0.0]
+        monkeypatch.setattr('api.authentication.time.monotonic',
+                            lambda: now[0])
+        cache.set(4, 'd')
+        now[0] = 61
+        assert cache.get(4) is None
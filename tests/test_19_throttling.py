@@ -0,0 +1,106 @@
+import pytest
+
+
+@pytest.fixture
+def rates(monkeypatch):
+    from api.throttling import SlidingWindowRateThrottle
+
+    def set_rates(**scopes):
+        for scope, rate in scopes.items():
+            monkeypatch.setitem(
+                SlidingWindowRateThrottle.THROTTLE_RATES, scope, rate
+            )
+    return set_rates
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    from api.throttling import SlidingWindowRateThrottle
+
+    now = [600.0]
+    monkeypatch.setattr(
+        SlidingWindowRateThrottle, 'timer', staticmethod(lambda: now[0])
+    )
+    return now
+
+
+class Test19Throttling:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_anon_limit_and_headers(self, client, rates, clock):
+        rates(anon='3/min')
+        for remaining in (2, 1, 0):
+            response = client.get('/api/v1/genres/')
+            assert response.status_code == 200
+            assert response['X-RateLimit-Limit'] == '3'
+            assert response['X-RateLimit-Remaining'] == str(remaining)
+        response = client.get('/api/v1/genres/')
+        assert response.status_code == 429, (
+            'Проверьте, что при превышении лимита возвращается статус 429'
+        )
+        assert int(response['Retry-After']) > 0
+        assert response['X-RateLimit-Remaining'] == '0'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_role_budgets(self, client, user_client, admin_client, rates,
+                             clock):
+        rates(anon='1/min', user='2/min', admin='4/min')
+        assert client.get('/api/v1/genres/').status_code == 200
+        assert client.get('/api/v1/genres/').status_code == 429
+        statuses = [
+            user_client.get('/api/v1/genres/').status_code for _ in range(3)
+        ]
+        assert statuses == [200, 200, 429], (
+            'Проверьте, что у роли user собственный лимит запросов'
+        )
+        statuses = [
+            admin_client.get('/api/v1/genres/').status_code for _ in range(5)
+        ]
+        assert statuses == [200] * 4 + [429], (
+            'Проверьте, что у роли admin собственный лимит запросов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_sliding_window(self, client, rates, clock):
+        rates(anon='4/min')
+        for _ in range(4):
+            assert client.get('/api/v1/genres/').status_code == 200
+        assert client.get('/api/v1/genres/').status_code == 429
+        clock[0] += 60
+        # Начало нового окна: предыдущее окно ещё учитывается целиком.
+        assert client.get('/api/v1/genres/').status_code == 429
+        clock[0] += 30
+        # Половина предыдущего окна: 4 * 0.5 = 2 из 4 запросов.
+        statuses = [
+            client.get('/api/v1/genres/').status_code for _ in range(3)
+        ]
+        assert statuses == [200, 200, 429]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_signup_scope(self, client, rates, clock):
+        rates(signup='2/hour')
+        statuses = [
+            client.post('/api/v1/auth/signup/', data={
+                'username': f'user{number}',
+                'email': f'user{number}@yamdb.fake',
+            }).status_code
+            for number in range(3)
+        ]
+        assert statuses == [200, 200, 429], (
+            'Проверьте, что регистрация ограничена отдельным лимитом'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_spoofed_forwarded_for(self, client, rates, clock):
+        rates(signup='2/hour')
+        statuses = [
+            client.post('/api/v1/auth/signup/', data={
+                'username': f'user{number}',
+                'email': f'user{number}@yamdb.fake',
+            }, HTTP_X_FORWARDED_FOR=f'10.0.0.{number}').status_code
+            for number in range(3)
+        ]
+        assert statuses == [200, 200, 429], (
+            'Проверьте, что лимит по IP не обходится подделанным '
+            'заголовком X-Forwarded-For'
+        )
@@ -0,0 +1,86 @@
+import re
+
+import pytest
+
+from tests.common import create_titles
+
+
+@pytest.fixture
+def metrics():
+    from api.metrics import registry
+
+    registry.clear()
+    return registry
+
+
+def sample(text, name, **labels):
+    pattern = name + r'\{' + ','.join(
+        f'{key}="{re.escape(str(value))}"' for key, value in labels.items()
+    ) + r'\} (\S+)'
+    match = re.search(pattern, text)
+    return float(match.group(1)) if match else None
+
+
+class Test20Metrics:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_metrics_per_route(self, client, admin_client, metrics):
+        create_titles(admin_client)
+        for _ in range(3):
+            assert client.get('/api/v1/titles/').status_code == 200
+        client.get('/api/v1/titles/0/')
+
+        assert client.get('/api/v1/metrics').status_code == 401, (
+            'Проверьте, что `/api/v1/metrics` недоступен анонимам'
+        )
+        response = admin_client.get('/api/v1/metrics')
+        assert response.status_code == 200, (
+            'Проверьте, что `/api/v1/metrics` доступен администратору'
+        )
+        assert response['Content-Type'].startswith('text/plain')
+        text = response.content.decode()
+        route = {'route': 'titles-list', 'method': 'GET'}
+        assert sample(
+            text, 'api_requests_total', **route, status=200
+        ) == 3, 'Проверьте, что запросы считаются по маршруту и статусу'
+        assert sample(
+            text, 'api_requests_total', route='titles-detail',
+            method='GET', status=404
+        ) == 1
+        assert sample(
+            text, 'api_request_duration_seconds_bucket', **route, le='+Inf'
+        ) == 3
+        assert sample(text, 'api_request_duration_seconds_count', **route) == 3
+        assert sample(text, 'api_response_size_bytes_sum', **route) > 0
+        assert sample(text, 'api_sql_queries_sum', **route) >= 3, (
+            'Проверьте, что считаются SQL-запросы каждого обращения'
+        )
+        assert sample(text, 'api_sql_duration_seconds_total', **route) > 0
+        assert sample(
+            text, 'api_requests_total', route='titles-list',
+            method='POST', status=201
+        ) == 2
+
+    def test_02_histogram_is_cumulative(self):
+        from api.metrics import Histogram
+
+        histogram = Histogram((1, 5))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value)
+        assert list(histogram.samples()) == [
+            ('1', 2), ('5', 3), ('+Inf', 4)
+        ]
+        assert histogram.sum == 14.5
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_scraper_allowlist(self, client, settings, metrics):
+        settings.METRICS_ALLOWED_IPS = ('10.0.0.5',)
+        assert client.get(
+            '/api/v1/metrics', REMOTE_ADDR='10.0.0.5'
+        ).status_code == 200, (
+            'Проверьте, что `/api/v1/metrics` доступен адресам из '
+            'METRICS_ALLOWED_IPS'
+        )
+        assert client.get(
+            '/api/v1/metrics', HTTP_X_FORWARDED_FOR='10.0.0.5'
+        ).status_code == 401
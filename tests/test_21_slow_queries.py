@@ -0,0 +1,79 @@
+import pytest
+
+from tests.common import create_titles
+
+
+@pytest.fixture
+def slow_log(settings):
+    from api.slow_queries import slow_queries
+
+    settings.SLOW_QUERY_THRESHOLD = 0
+    slow_queries.clear()
+    return slow_queries
+
+
+class Test21SlowQueries:
+
+    def test_01_normalize(self):
+        from api.slow_queries import normalize
+
+        assert normalize(
+            "SELECT * FROM t WHERE a = %s AND b = 'x''y'\n"
+            "  AND c IN (%s, %s, %s) LIMIT 21"
+        ) == 'SELECT * FROM t WHERE a = ? AND b = ? AND c IN (...) LIMIT ?', (
+            'Проверьте, что форма запроса не содержит значений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_slow_queries_logged(self, client, admin_client, slow_log,
+                                    caplog):
+        create_titles(admin_client)
+        slow_log.clear()
+        caplog.clear()
+        response = client.get('/api/v1/titles/?year=2000')
+        assert response.status_code == 200
+        assert any(
+            record.name == 'api.slow_queries' for record in caplog.records
+        ), 'Проверьте, что медленные запросы попадают в журнал'
+
+        shapes = slow_log.top()
+        titles = [
+            entry for entry in shapes
+            if entry['shape'].startswith('SELECT')
+            and 'FROM "reviews_title"' in entry['shape']
+        ]
+        assert titles, 'Проверьте, что запрос к произведениям сохранён'
+        entry = titles[0]
+        assert '2000' not in entry['shape'], (
+            'Проверьте, что форма запроса не содержит значений параметров'
+        )
+        assert '2000' in entry['params']
+        assert entry['view'] == 'api:titles-list'
+        assert entry['action'] == 'list'
+        assert entry['plan'], 'Проверьте, что сохраняется план запроса'
+        assert not any(
+            entry['shape'].startswith('EXPLAIN') for entry in shapes
+        ), 'Проверьте, что EXPLAIN не попадает в журнал'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_top_is_bounded(self, client, admin_client, slow_log,
+                               settings):
+        settings.SLOW_QUERY_TOP = 2
+        create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        assert len(slow_log.top()) == 2, (
+            'Проверьте, что в памяти хранится не больше SLOW_QUERY_TOP форм'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_admin_only(self, client, user_client, admin_client,
+                           slow_log):
+        url = '/api/v1/slow-queries/'
+        assert client.get(url).status_code == 401
+        assert user_client.get(url).status_code == 403, (
+            'Проверьте, что журнал медленных запросов доступен только '
+            'администратору'
+        )
+        response = admin_client.get(url)
+        assert response.status_code == 200
+        assert isinstance(response.json(), list)
@@ -0,0 +1,67 @@
+import pytest
+
+from tests.common import create_titles
+
+
+class Test22Profiling:
+
+    def get_profile(self, admin_client, response):
+        assert 'X-Profile-Id' in response, (
+            'Проверьте, что ответ профилированного запроса содержит '
+            'заголовок `X-Profile-Id`'
+        )
+        report = admin_client.get(
+            f'/api/v1/profiles/{response["X-Profile-Id"]}/'
+        )
+        assert report.status_code == 200
+        return report.json()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_admin_profile(self, admin_client):
+        create_titles(admin_client)
+        response = admin_client.get('/api/v1/titles/?profile=1')
+        assert response.status_code == 200
+        assert response.json()['count'] == 2, (
+            'Проверьте, что профилирование не меняет ответ'
+        )
+        report = self.get_profile(admin_client, response)
+        assert report['status'] == 200
+        assert report['path'] == '/api/v1/titles/?profile=1'
+        assert report['functions'], (
+            'Проверьте, что отчёт содержит функции по суммарному времени'
+        )
+        cumulative = [row['cumulative'] for row in report['functions']]
+        assert cumulative == sorted(cumulative, reverse=True)
+        assert report['allocations'] is None
+        assert any(
+            'reviews_title' in query['sql'] for query in report['sql']
+        ), 'Проверьте, что отчёт содержит SQL-запросы запроса'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_memory_profile(self, admin_client):
+        response = admin_client.get(
+            '/api/v1/genres/', HTTP_X_PROFILE='memory'
+        )
+        report = self.get_profile(admin_client, response)
+        assert report['allocations'], (
+            'Проверьте, что с `X-Profile: memory` отчёт содержит места '
+            'выделения памяти'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_not_admin(self, client, user_client, moderator_client,
+                          admin_client):
+        for profiled_client in (client, user_client, moderator_client):
+            response = profiled_client.get(
+                '/api/v1/genres/?profile=1', HTTP_X_PROFILE='1'
+            )
+            assert response.status_code == 200
+            assert 'X-Profile-Id' not in response, (
+                'Проверьте, что профилирование доступно только администратору'
+            )
+        response = admin_client.get('/api/v1/genres/')
+        assert 'X-Profile-Id' not in response, (
+            'Проверьте, что без флага запрос не профилируется'
+        )
+        assert user_client.get('/api/v1/profiles/abc/').status_code == 403
+        assert admin_client.get('/api/v1/profiles/abc/').status_code == 404
@@ -0,0 +1,76 @@
+import pytest
+from django.core.management import call_command
+
+SIZES = dict(
+    users=50, categories=3, genres=5, titles=40, reviews=600, comments=300
+)
+
+
+class Test23GenerateDataset:
+
+    def test_01_zipf_distribution(self):
+        from reviews.dataset import DatasetGenerator
+
+        counts = DatasetGenerator(
+            users=1000, categories=1, genres=1, titles=1000, reviews=50000,
+            comments=0
+        ).reviews_per_title()
+        assert sum(counts) == 50000
+        counts.sort(reverse=True)
+        assert counts[0] > 20 * counts[len(counts) // 2], (
+            'Проверьте, что у самых популярных произведений отзывов '
+            'намного больше, чем у типичных'
+        )
+        assert counts[0] <= 1000, (
+            'Проверьте, что пользователь оценивает произведение один раз'
+        )
+
+    def test_02_reviews_limited_by_users(self):
+        from django.core.management.base import CommandError
+
+        with pytest.raises(CommandError):
+            call_command(
+                'generate_dataset', csv='unused', users=2, titles=2,
+                reviews=5
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_generate_into_database(self, django_user_model):
+        from reviews.models import ChangeLog, Comment, Review, Title
+
+        call_command('generate_dataset', batch_size=100, **SIZES)
+        assert django_user_model.objects.count() == 50
+        assert Title.objects.count() == 40
+        assert Review.objects.count() == 600
+        assert Comment.objects.count() == 300
+        assert sum(
+            Title.objects.values_list('reviews_count', flat=True)
+        ) == 600, 'Проверьте, что после генерации пересчитывается рейтинг'
+        assert Review.objects.filter(pub_date__year__lt=2015).count() == 0, (
+            'Проверьте, что даты отзывов берутся из генератора'
+        )
+        assert ChangeLog.objects.filter(model='review').count() == 600, (
+            'Проверьте, что сгенерированные отзывы попадают в журнал '
+            'изменений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_csv_is_deterministic_and_importable(self, tmp_path):
+        from reviews.models import Review
+
+        first, second = tmp_path / 'first', tmp_path / 'second'
+        call_command('generate_dataset', csv=str(first), seed=7, **SIZES)
+        call_command('generate_dataset', csv=str(second), seed=7, **SIZES)
+        for path in first.iterdir():
+            assert path.read_bytes() == (second / path.name).read_bytes(), (
+                'Проверьте, что одно зерно даёт одинаковые данные'
+            )
+
+        reject_file = tmp_path / 'rejects.csv'
+        call_command(
+            'csv_import', data_dir=str(first), reject_file=str(reject_file)
+        )
+        assert not reject_file.exists(), (
+            'Проверьте, что csv_import принимает все сгенерированные строки'
+        )
+        assert Review.objects.count() == 600
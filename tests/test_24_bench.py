@@ -0,0 +1,64 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+
+class Test24Bench:
+
+    def test_01_percentile(self):
+        from bench.runner import percentile
+
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([7], 95) == 7
+        assert percentile([], 50) is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_requires_data(self, tmp_path):
+        with pytest.raises(CommandError):
+            call_command(
+                'bench', scenario=['catalog'], iterations=1,
+                output=str(tmp_path / 'bench.json')
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_run_and_compare(self, tmp_path, capsys):
+        from api.throttling import SlidingWindowRateThrottle
+
+        rates = SlidingWindowRateThrottle.THROTTLE_RATES
+        call_command(
+            'generate_dataset', users=20, categories=2, genres=3, titles=10,
+            reviews=60, comments=20
+        )
+        output = tmp_path / 'bench.json'
+        call_command(
+            'bench', iterations=3, concurrency=1, output=str(output)
+        )
+        report = json.loads(output.read_text())
+        assert set(report['scenarios']) == {
+            'catalog', 'reviews', 'comments', 'auth'
+        }
+        for name, result in report['scenarios'].items():
+            assert result['requests'] > 0
+            assert result['errors'] == 0, (
+                f'Проверьте, что сценарий {name} выполняется без ошибок: '
+                f'{result["statuses"]}'
+            )
+            assert result['latency_ms']['p50'] <= result['latency_ms']['p99']
+            assert result['queries_per_request']['mean'] > 0
+        assert set(report['scenarios']['auth']['endpoints']) == {
+            'signup', 'token'
+        }
+        assert SlidingWindowRateThrottle.THROTTLE_RATES is rates, (
+            'Проверьте, что лимиты запросов восстанавливаются после теста'
+        )
+
+        capsys.readouterr()
+        call_command(
+            'bench', scenario=['catalog'], iterations=2, concurrency=2,
+            output=str(tmp_path / 'second.json'), compare=str(output)
+        )
+        assert 'catalog p95:' in capsys.readouterr().out
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+
+class Test25SerializerBench:
+
+    def test_01_in_memory_objects(self):
+        # Без отметки django_db любой запрос к базе завершит тест ошибкой.
+        from bench.serializers import CASES
+
+        for serializer_class, build in CASES.values():
+            data = serializer_class(build(3), many=True).data
+            assert len(data) == 3
+        title = CASES['title'][0](CASES['title'][1](1), many=True).data[0]
+        assert title['category']['slug'] and title['genre'], (
+            'Проверьте, что произведения содержат категорию и жанры'
+        )
+
+    def test_02_regressions(self):
+        from bench.serializers import regressions
+
+        baseline = {'title': {'10': {
+            'objects_per_sec': 1000, 'peak_bytes_per_object': 100,
+        }}}
+        results = {'title': {
+            '10': {'objects_per_sec': 700, 'peak_bytes_per_object': 105},
+            '1000': {'objects_per_sec': 1, 'peak_bytes_per_object': 1},
+        }}
+        failed = list(regressions(baseline, results, 0.2, 0.1))
+        assert len(failed) == 1 and 'title[10]' in failed[0], (
+            'Проверьте, что замедление сверх порога считается регрессией, '
+            'а замеры без базы не проверяются'
+        )
+        results['title']['10']['peak_bytes_per_object'] = 120
+        assert len(list(regressions(baseline, results, 0.5, 0.1))) == 1
+
+    def test_03_command(self, tmp_path):
+        output = tmp_path / 'serializers.json'
+        call_command(
+            'bench_serializers', sizes=[10], min_time=0.01,
+            output=str(output)
+        )
+        results = json.loads(output.read_text())
+        assert set(results) == {'title', 'review', 'comment'}
+        assert results['title']['10']['objects_per_sec'] > 0
+
+        for sizes in results.values():
+            sizes['10']['objects_per_sec'] *= 1000
+        output.write_text(json.dumps(results))
+        with pytest.raises(CommandError):
+            call_command(
+                'bench_serializers', sizes=[10], min_time=0.01,
+                baseline=str(output)
+            )
@@ -0,0 +1,54 @@
+import pytest
+from django.core.cache import cache
+
+from tests.common import create_comments
+
+
+class Test26CompiledSerializers:
+
+    def responses(self, client, urls):
+        cache.clear()
+        result = []
+        for url in urls:
+            response = client.get(url)
+            assert response.status_code == 200
+            result.append(response.content)
+        return result
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_same_json(self, client, admin_client, admin, monkeypatch):
+        from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+        from reviews.models import Title
+
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        # Пустые рейтинг, описание и категория выводятся как null.
+        bare = Title.objects.create(name='Без категории', year=1999)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        review_url = f'{title_url}reviews/{reviews[0]["id"]}/'
+        urls = (
+            '/api/v1/titles/', title_url, f'/api/v1/titles/{bare.id}/',
+            f'{title_url}reviews/', review_url,
+            f'{review_url}comments/', f'{review_url}comments/'
+            f'{comments[0]["id"]}/',
+            '/api/v1/titles/?pagination=cursor',
+        )
+        compiled = self.responses(client, urls)
+        for viewset in (TitleViewSet, ReviewViewSet, CommentViewSet):
+            monkeypatch.setattr(viewset, 'compiled_read', False)
+        assert compiled == self.responses(client, urls), (
+            'Проверьте, что compiled-сериализаторы выводят тот же JSON, '
+            'что и исходные'
+        )
+
+    def test_02_writes_use_model_serializers(self):
+        from api.compiled import CompiledSerializerMixin
+        from api.views import TitleViewSet
+
+        view = TitleViewSet()
+        for action, compiled in (('list', True), ('retrieve', True),
+                                 ('update', False), ('create', False)):
+            view.action = action
+            view.request = type('Request', (), {'method': 'GET'})
+            assert issubclass(
+                view.get_serializer_class(), CompiledSerializerMixin
+            ) is compiled
@@ -0,0 +1,92 @@
+import pytest
+
+from tests.common import (create_comments, create_titles,
+                          get_with_queries)
+
+
+class Test27SparseFieldsets:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_fields(self, client, admin_client):
+        create_titles(admin_client)
+        response, queries = get_with_queries(
+            client, '/api/v1/titles/?fields=id,name,rating'
+        )
+        data = response.json()
+        assert all(
+            set(title) == {'id', 'name', 'rating'}
+            for title in data['results']
+        ), 'Проверьте, что `?fields=` оставляет только перечисленные поля'
+        titles = [sql for sql in queries if 'FROM "reviews_title"' in sql]
+        assert not any('reviews_genre' in sql for sql in queries), (
+            'Проверьте, что без поля `genre` жанры не загружаются'
+        )
+        assert not any('reviews_category' in sql for sql in titles), (
+            'Проверьте, что без поля `category` категория не присоединяется'
+        )
+        assert not any('"description"' in sql for sql in titles), (
+            'Проверьте, что ненужные колонки не выбираются из базы'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_titles_omit(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response, queries = get_with_queries(
+            client, f'/api/v1/titles/{titles[0]["id"]}/?omit=genre'
+        )
+        data = response.json()
+        assert set(data) == {
+            'id', 'name', 'year', 'rating', 'description', 'category'
+        }
+        assert data['category']['slug']
+        assert not any('reviews_genre' in sql for sql in queries)
+
+        full = client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert full['genre'], (
+            'Проверьте, что ответ без параметров не меняется и не берётся '
+            'из кэша сокращённого ответа'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_reviews_and_comments(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response, queries = get_with_queries(client, f'{url}?fields=id,score')
+        data = response.json()
+        assert [set(review) for review in data['results']] == [
+            {'id', 'score'}
+        ] * 3
+        assert not any('users_user' in sql for sql in queries), (
+            'Проверьте, что без поля `author` авторы не присоединяются'
+        )
+        assert len(queries) <= 4
+
+        response, queries = get_with_queries(
+            client, f'{url}?fields=id,title&pagination=cursor'
+        )
+
+        data = response.json()
+        assert data['results'][0]['title'] == titles[0]['name']
+        assert len(queries) <= 3, (
+            'Проверьте, что произведение отзывов не загружается отдельным '
+            'запросом для каждого отзыва'
+        )
+
+        comments_url = f'{url}{reviews[0]["id"]}/comments/'
+        response, _ = get_with_queries(
+            client, f'{comments_url}?fields=text,author'
+        )
+        data = response.json()
+        assert set(data['results'][0]) == {'text', 'author'}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_unknown_field(self, client, admin_client):
+        response = client.get('/api/v1/titles/?fields=id,secret')
+        assert response.status_code == 400, (
+            'Проверьте, что неизвестное поле в `?fields=` возвращает 400'
+        )
+        response = admin_client.get('/api/v1/users/?fields=username')
+        assert response.status_code == 200
+        assert set(response.json()['results'][0]) == {'username'}
+        response = admin_client.get('/api/v1/users/me/?omit=bio,email')
+        assert 'bio' not in response.json() and 'username' in response.json()
@@ -0,0 +1,99 @@
+import pytest
+
+from tests.common import create_comments, get_with_queries
+
+
+class Test28Expand:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_expand(self, client, admin_client, admin, settings):
+        settings.EXPAND_LIMIT = 2
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        admin_client.post(
+            f'{title_url}reviews/{reviews[2]["id"]}/comments/',
+            data={'text': 'К новому отзыву'}
+        )
+        response, queries = get_with_queries(
+            client, f'{title_url}?expand=reviews,reviews.comments'
+        )
+        data = response.json()
+        assert data['name'] == titles[0]['name']
+        embedded = data['reviews']
+        assert embedded['count'] == 3
+        assert [review['id'] for review in embedded['results']] == sorted(
+            (review['id'] for review in reviews), reverse=True
+        )[:2], 'Проверьте, что встраиваются последние EXPAND_LIMIT отзывов'
+        assert embedded['results'][0]['title'] == titles[0]['name']
+        assert 'ETag' not in response
+
+        # Ссылка next продолжает список со следующего отзыва.
+        rest = client.get(embedded['next']).json()
+        assert [review['id'] for review in rest['results']] == [
+            reviews[0]['id']
+        ]
+
+        newest, second = embedded['results']
+        assert newest['comments']['count'] == 1
+        assert newest['comments']['results'][0]['author'] == admin.username
+        assert newest['comments']['next'] is None
+        assert second['comments'] == {'count': 0, 'next': None, 'results': []}
+        assert len(queries) <= 5, (
+            'Проверьте, что отзывы и комментарии загружаются пакетно, '
+            'а не запросом на каждый отзыв'
+        )
+
+        response, sparse_queries = get_with_queries(
+            client, f'{title_url}?fields=id&expand=reviews,reviews.comments'
+        )
+        data = response.json()
+        assert set(data) == {'id', 'reviews'}
+        assert data['reviews']['count'] == 3
+        assert data['reviews']['results'][0]['title'] == titles[0]['name']
+        assert len(sparse_queries) <= len(queries), (
+            'Проверьте, что ?fields= не откладывает колонки, которые '
+            'читает ?expand='
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_review_list_expand(self, client, admin_client, admin,
+                                   settings):
+        settings.EXPAND_LIMIT = 2
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/?expand=comments'
+        response, queries = get_with_queries(client, url)
+        results = {
+            review['id']: review for review in response.json()['results']
+        }
+        embedded = results[reviews[0]['id']]['comments']
+        assert embedded['count'] == 3
+        assert [comment['id'] for comment in embedded['results']] == sorted(
+            (comment['id'] for comment in comments), reverse=True
+        )[:2]
+        assert embedded['next']
+        assert results[reviews[1]['id']]['comments']['count'] == 0
+        assert len(queries) <= 5, (
+            'Проверьте, что комментарии всех отзывов страницы загружаются '
+            'одним запросом'
+        )
+
+        # Новый комментарий виден сразу: ответ с expand не кэшируется.
+        admin_client.post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}'
+            '/comments/', data={'text': 'Новый'}
+        )
+        response, _ = get_with_queries(client, url)
+        results = {
+            review['id']: review for review in response.json()['results']
+        }
+        assert results[reviews[1]['id']]['comments']['count'] == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_unknown_expand(self, client, admin_client, admin):
+        _, _, titles, _, _ = create_comments(admin_client, admin)
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/?expand=genre'
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что неизвестное значение `?expand=` возвращает 400'
+        )